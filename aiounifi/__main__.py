@@ -27,18 +27,19 @@ async def unifi_controller(
     """Set up UniFi controller and verify credentials."""
     controller = UnifiClient(
         Configuration(
-            session,
             host,
             username=username,
             password=password,
             port=port,
             site=site,
             ssl_context=ssl_context if ssl_context is not None else False,
+            session=session,
         )
     )
 
     try:
         async with timeout(10):
+            await controller.connect()
             await controller.login()
         return controller
 
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import asyncio
+from contextlib import nullcontext
 import datetime
 from functools import wraps
 from http import HTTPStatus
@@ -35,7 +37,8 @@ from .interfaces.traffic_routes import TrafficRoutes
 from .interfaces.traffic_rules import TrafficRules
 from .interfaces.vouchers import Vouchers
 from .interfaces.wlans import Wlans
-from .models.configuration import Configuration
+from .models.configuration import Configuration, RetryPolicy
+from .scheduler import RequestPriority, RequestScheduler, RetryBudget
 
 LOGGER = logging.getLogger(__name__)
 
@@ -59,10 +62,29 @@ class UnifiClient:
 
     session: aiohttp.ClientSession
 
-    def __init__(self, config: Configuration) -> None:
-        """Session setup."""
+    def __init__(
+        self, config: Configuration, scheduler: RequestScheduler | None = None
+    ) -> None:
+        """Session setup.
+
+        Requests are limited by the scheduler, which can be shared with clients
+        of other sites on the same controller. Without one, connect creates a
+        scheduler if "max_concurrent_requests" is configured.
+
+        Clients of other sites can also share connections through the
+        "connector" of the configuration. A "session" of the caller is used as
+        is, the CSRF token of the login is kept per client and sent with each
+        request. The session cookies hold the login, so a session must not be
+        shared by several clients.
+        """
         self.config = config
+        self.scheduler = scheduler
+        self.retry_budget: RetryBudget | None = None
         self._is_unifi_os: bool | None = None
+        self._request_options: dict[str, Any] = {}
+        self._headers: dict[str, str] = {}
+        self._login_lock = asyncio.Lock()
+        self._login_generation = 0
 
         self.messages = MessageHandler(self)
         self.events = EventHandler(self)
@@ -88,31 +110,60 @@ class UnifiClient:
 
     async def connect(self) -> None:
         """Check if controller is running UniFi OS."""
-        self.session = aiohttp.ClientSession(raise_for_status=errors.raise_for_status)
+        if self.scheduler is None and self.config.max_concurrent_requests is not None:
+            self.scheduler = RequestScheduler(self.config.max_concurrent_requests)
+        if self.config.session is not None:
+            # A session of the caller keeps its own JSON serializer, errors
+            # are raised per request instead.
+            self.session = self.config.session
+            self._request_options = {"raise_for_status": errors.raise_for_status}
+        else:
+            self.session = aiohttp.ClientSession(
+                connector=self.config.connector or self._create_connector(),
+                connector_owner=self.config.connector is None,
+                raise_for_status=errors.raise_for_status,
+                json_serialize=self.config.codec.dumps,
+            )
         # We have to set `allow_redirects` to False here because the redirect
         # is what is used to detect new-style API or old-style API. A 200 response
         # uses the new API paths, where a 302 is older controllers.
         response = await self.session.get(
-            self.config.url, allow_redirects=False, ssl=self.config.ssl_context
+            self.config.url,
+            allow_redirects=False,
+            ssl=self.config.ssl_context,
+            **self._request_options,
         )
         if response.status == HTTPStatus.OK:
             self._is_unifi_os = True
-            self.session.cookie_jar.clear_domain(self.config.host)
+            if self.config.session is None:
+                # Cookies of a session of the caller may belong to other clients
+                self.session.cookie_jar.clear_domain(self.config.host)
         elif response.status == HTTPStatus.FOUND:
             self._is_unifi_os = False
         else:
-            await self.session.close()
+            if self.config.session is None:
+                await self.session.close()
             delattr(self, "session")
             raise errors.AiounifiException(
                 f"Could not determine if controller is unifi os. Got HTTP status {response.status}"
             )
         LOGGER.debug("Talking to UniFi OS device: %s", self._is_unifi_os)
 
+    def _create_connector(self) -> aiohttp.TCPConnector:
+        """Create a connector from the connection pool settings."""
+        pool = self.config.connection_pool
+        return aiohttp.TCPConnector(
+            limit=pool.limit,
+            limit_per_host=pool.limit_per_host,
+            keepalive_timeout=pool.keepalive_timeout,
+            ttl_dns_cache=pool.dns_cache_ttl,
+        )
+
     @check_session
     async def login(self) -> None:
         """Log in to controller."""
 
-        self.session.headers.clear()
+        self._headers = {}
         url = f"{self.config.url}/api{'/auth/login' if self.is_unifi_os else '/login'}"
 
         auth = {
@@ -121,19 +172,31 @@ class UnifiClient:
             "rememberMe": True,
         }
 
-        response = await self.session.post(url, json=auth)
+        response = await self.session.post(url, json=auth, **self._request_options)
         if response.content_type != "application/json":
             LOGGER.debug("Login Failed not JSON: '%s'", await response.read())
             raise errors.RequestError("Login Failed: Host starting up")
 
-        data = await response.json()
+        data = await response.json(loads=self.config.codec.loads)
         errors.raise_for_unifi_error(1, data)
 
         if (csrf_token := response.headers.get("x-csrf-token")) is not None:
-            self.session.headers["x-csrf-token"] = csrf_token
+            self._headers["x-csrf-token"] = csrf_token
 
         LOGGER.debug("Logged in to UniFi %s", url)
 
+    async def _relogin(self, login_generation: int) -> None:
+        """Log in again after a request sent at login_generation was rejected.
+
+        Only the first rejected request logs in, requests rejected meanwhile
+        wait for that login and are replayed without logging in again.
+        """
+        async with self._login_lock:
+            if login_generation != self._login_generation:
+                return
+            self._login_generation += 1
+            await self.login()
+
     @property
     def is_unifi_os(self):
         """Indite whether or not this client connection is to a Unifi OS device."""
@@ -217,20 +280,93 @@ class UnifiClient:
             "url": url,
             "json": data,
             "ssl": self.config.ssl_context,
+            **self._request_options,
         }
-        try:
-            async with self.session.request(**request_args) as response:
-                response_data = await response.json() if response.status != 204 else {}
-        except errors.LoginRequired:
-            # Session likely expired, try again
-            await self.login()
-            async with self.session.request(**request_args) as response:
-                response_data = await response.json() if response.status != 204 else {}
+        if (policy := self.config.retry_policy) is None:
+            response_data = await self._send(request_args)
+        else:
+            if self.retry_budget is None:
+                self.retry_budget = RetryBudget(
+                    policy.budget_ratio, policy.budget_capacity
+                )
+            self.retry_budget.deposit()
+            idempotent = (
+                method in policy.idempotent_methods
+                if endpoint.idempotent is None
+                else endpoint.idempotent
+            )
+            response_data = (
+                await self._send_with_retries(policy, self.retry_budget, request_args)
+                if idempotent
+                else await self._send(request_args)
+            )
 
         if isinstance(endpoint, ApiEndpoint):
             errors.raise_for_unifi_error(endpoint.version, response_data)
         return ApiResponse(**response_data)
 
+    async def _send(self, request_args: dict[str, Any]) -> dict[str, Any]:
+        """Send a request once a slot is free, logging in again if needed."""
+        loads = self.config.codec.loads
+        if self._login_lock.locked():
+            # Wait for an ongoing re-login rather than sending a request bound to fail
+            async with self._login_lock:
+                pass
+        login_generation = self._login_generation
+        async with (
+            nullcontext()
+            if self.scheduler is None
+            else self.scheduler.slot(
+                RequestPriority.LIST
+                if request_args["method"] == "get"
+                else RequestPriority.COMMAND,
+                self.config.site,
+            )
+        ):
+            try:
+                async with self.session.request(
+                    **request_args, headers=self._headers
+                ) as response:
+                    response_data = (
+                        await response.json(loads=loads)
+                        if response.status != 204
+                        else {}
+                    )
+            except errors.LoginRequired:
+                # Session likely expired, try again
+                await self._relogin(login_generation)
+                async with self.session.request(
+                    **request_args, headers=self._headers
+                ) as response:
+                    response_data = (
+                        await response.json(loads=loads)
+                        if response.status != 204
+                        else {}
+                    )
+        return response_data
+
+    async def _send_with_retries(
+        self, policy: RetryPolicy, budget: RetryBudget, request_args: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Send a request, retrying transient errors as allowed by policy and budget."""
+        retry = 0
+        while True:
+            try:
+                return await self._send(request_args)
+            except policy.retry_on as err:
+                delay = policy.delay(retry, getattr(err, "retry_after", None))
+                if delay is None or not budget.withdraw():
+                    raise
+                LOGGER.debug(
+                    "Retrying %s %s in %.2f seconds after %r",
+                    request_args["method"],
+                    request_args["url"],
+                    delay,
+                    err,
+                )
+                await asyncio.sleep(delay)
+                retry += 1
+
     @check_session
     async def start_websocket(self) -> None:
         """Run the websocket listener loop.
@@ -245,6 +381,7 @@ class UnifiClient:
         try:
             async with self.session.ws_connect(
                 url,
+                headers=self._headers,
                 ssl=self.config.ssl_context,
                 heartbeat=15,
                 compress=12,
@@ -252,7 +389,7 @@ class UnifiClient:
                 LOGGER.debug(
                     "Connected to UniFi websocket %s, headers: %s, cookiejar: %s",
                     url,
-                    self.session.headers,
+                    self._headers,
                     self.session.cookie_jar._cookies,  # type: ignore[attr-defined]
                 )
                 async for message in websocket_connection:
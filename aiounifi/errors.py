@@ -1,14 +1,19 @@
 """Aiounifi errors."""
 
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
 from http import HTTPStatus
 from typing import Any
 
-from aiohttp import ClientResponse
+from aiohttp import ClientResponse, hdrs
 
 
 class AiounifiException(Exception):
     """Base error for aiounifi."""
 
+    retry_after: float | None = None
+    """Seconds to wait before retrying as requested by the controller."""
+
 
 class NotConnectedError(AiounifiException):
     """Raised when the client is not yet connected to the controller."""
@@ -25,6 +30,10 @@ class ResponseError(AiounifiException):
     """Invalid response."""
 
 
+class TooManyRequests(ResponseError):
+    """HTTP 429, requests are rate limited."""
+
+
 class NotFoundError(AiounifiException):
     """HTTP 404."""
 
@@ -70,9 +79,12 @@ HTTP_ERRORS: dict[int, type] = {
     HTTPStatus.NOT_FOUND: NotFoundError,
     HTTPStatus.BAD_GATEWAY: BadGateway,
     HTTPStatus.SERVICE_UNAVAILABLE: ServiceUnavailable,
-    HTTPStatus.TOO_MANY_REQUESTS: ResponseError,
+    HTTPStatus.TOO_MANY_REQUESTS: TooManyRequests,
 }
 
+# Statuses where the controller can ask to wait with a Retry-After header.
+RETRY_AFTER_STATUSES = {HTTPStatus.TOO_MANY_REQUESTS, HTTPStatus.SERVICE_UNAVAILABLE}
+
 UNIFI_ERRORS = {
     "api.err.Invalid": Unauthorized,
     "api.err.LoginRequired": LoginRequired,
@@ -94,13 +106,34 @@ def raise_for_unifi_error(version: int, response_data: dict[str, Any] | None):
             )
 
 
+def parse_retry_after(value: str | None) -> float | None:
+    """Return the seconds to wait from a Retry-After header value."""
+    if value is None:
+        return None
+    if value.strip().isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        # Dates with a "-0000" zone are parsed without one, they are UTC
+        retry_at = retry_at.replace(tzinfo=UTC)
+    return max((retry_at - datetime.now(UTC)).total_seconds(), 0.0)
+
+
 async def raise_for_status(response: ClientResponse) -> None:
     """Raise an error if the response status indicates an HTTP error."""
     error_cls = HTTP_ERRORS.get(response.status)
 
     if error_cls:
-        raise error_cls(
+        error = error_cls(
             f"Received HTTP {response.status} for {response.request_info.url}"
         )
+        if response.status in RETRY_AFTER_STATUSES:
+            error.retry_after = parse_retry_after(
+                response.headers.get(hdrs.RETRY_AFTER)
+            )
+        raise error
 
     response.raise_for_status()
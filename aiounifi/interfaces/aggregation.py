@@ -0,0 +1,246 @@
+"""Grouped aggregates over handler items, kept up to date as items change."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass, field
+from operator import attrgetter
+from typing import TYPE_CHECKING
+
+from ..models.api import ApiItem
+from .api_handlers import APIHandler, ItemEvent
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    from ..models.client import Client
+    from ..models.device import Device, Port
+    from .clients import Clients
+    from .devices import Devices
+    from .ports import Ports
+
+Contribution = tuple[Hashable, tuple[float | None, ...]]
+
+
+@dataclass
+class GroupStats:
+    """Item count and per value sums of a group."""
+
+    count: int = 0
+    sums: dict[str, float] = field(default_factory=dict)
+    counts: dict[str, int] = field(default_factory=dict)
+    """Number of items with a value, items where the value is None are skipped."""
+
+    def mean(self, name: str) -> float | None:
+        """Return the mean of a value, None if no item has the value."""
+        if not (count := self.counts.get(name)):
+            return None
+        return self.sums[name] / count
+
+
+class Aggregation[T: ApiItem]:
+    """Count items and sum their values per group.
+
+    "group_by" returns the group of an item from its object id and item, items
+    in group None are not aggregated. "values" maps value names to the name of
+    the item attribute holding the value, or a function returning the value of
+    an item. Items with value None are counted but their value is skipped.
+
+    Groups are computed in one pass when created or rebuilt and updated per
+    added, changed or deleted item after that. Float sums can drift slightly
+    from repeated updates, rebuild recomputes them.
+    """
+
+    def __init__(
+        self,
+        handler: APIHandler[T],
+        group_by: Callable[[str, T], Hashable | None],
+        values: dict[str, str | Callable[[T], float | None]],
+    ) -> None:
+        """Aggregate the items of handler and subscribe to their changes."""
+        self.handler = handler
+        self.group_by = group_by
+        self.values = values
+        self._getters: tuple[Callable[[T], float | None], ...] = tuple(
+            attrgetter(value) if isinstance(value, str) else value
+            for value in values.values()
+        )
+        self.groups: dict[Hashable, GroupStats] = {}
+        self._contributions: dict[str, Contribution] = {}
+        self.rebuild()
+        self._unsubscribe = handler.subscribe(self._item_event)
+
+    def close(self) -> None:
+        """Stop updating the aggregation."""
+        self._unsubscribe()
+
+    def rebuild(self, use_numpy: bool | None = None) -> None:
+        """Recompute all groups from the handler items.
+
+        Sums are computed with NumPy if "use_numpy" or by default when it is
+        installed.
+        """
+        if use_numpy is None:
+            use_numpy = np is not None
+        elif use_numpy and np is None:
+            raise ValueError("NumPy is not installed")
+        contributions = {
+            obj_id: contribution
+            for obj_id, item in zip(self.handler, self.handler.data.values())
+            if (contribution := self._contribution(obj_id, item)) is not None
+        }
+        self._contributions = contributions
+        if use_numpy and contributions:
+            self.groups = self._numpy_groups(list(contributions.values()))
+            return
+        self.groups = {}
+        for contribution in contributions.values():
+            self._add(contribution)
+
+    def _numpy_groups(
+        self, contributions: list[Contribution]
+    ) -> dict[Hashable, GroupStats]:
+        """Compute groups from contributions using NumPy."""
+        group_index: dict[Hashable, int] = {}
+        indexes = np.fromiter(
+            (
+                group_index.setdefault(group, len(group_index))
+                for group, _ in contributions
+            ),
+            dtype=np.intp,
+            count=len(contributions),
+        )
+        values = np.array(
+            [item_values for _, item_values in contributions], dtype=float
+        ).reshape(len(contributions), len(self.values))
+        present = ~np.isnan(values)
+        values[~present] = 0.0
+
+        count = np.bincount(indexes, minlength=len(group_index))
+        groups = {
+            group: GroupStats(int(count[index])) for group, index in group_index.items()
+        }
+        for column, name in enumerate(self.values):
+            sums = np.bincount(
+                indexes, weights=values[:, column], minlength=len(group_index)
+            )
+            counts = np.bincount(
+                indexes, weights=present[:, column], minlength=len(group_index)
+            )
+            for group, index in group_index.items():
+                groups[group].sums[name] = float(sums[index])
+                groups[group].counts[name] = int(counts[index])
+        return groups
+
+    def _contribution(self, obj_id: str, item: T) -> Contribution | None:
+        """Return the group and values of an item, None if it isn't grouped."""
+        if (group := self.group_by(obj_id, item)) is None:
+            return None
+        return group, tuple([getter(item) for getter in self._getters])
+
+    def _add(self, contribution: Contribution) -> None:
+        """Add the values of an item to its group."""
+        group, values = contribution
+        if (stats := self.groups.get(group)) is None:
+            stats = self.groups[group] = GroupStats(
+                sums=dict.fromkeys(self.values, 0.0),
+                counts=dict.fromkeys(self.values, 0),
+            )
+        stats.count += 1
+        for name, value in zip(self.values, values, strict=True):
+            if value is not None:
+                stats.sums[name] += value
+                stats.counts[name] += 1
+
+    def _remove(self, contribution: Contribution) -> None:
+        """Remove the values of an item from its group."""
+        group, values = contribution
+        stats = self.groups[group]
+        stats.count -= 1
+        if not stats.count:
+            del self.groups[group]
+            return
+        for name, value in zip(self.values, values, strict=True):
+            if value is not None:
+                stats.sums[name] -= value
+                stats.counts[name] -= 1
+
+    def _item_event(self, event: ItemEvent, obj_id: str) -> None:
+        """Move the values of a changed item between groups."""
+        if (old := self._contributions.pop(obj_id, None)) is not None:
+            self._remove(old)
+        if event is ItemEvent.DELETED:
+            return
+        if (new := self._contribution(obj_id, self.handler[obj_id])) is not None:
+            self._contributions[obj_id] = new
+            self._add(new)
+
+
+def _float(value: str | None) -> float | None:
+    """Convert a numeric string to float, None if empty or invalid."""
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+def access_point_clients(clients: Clients) -> Aggregation[Client]:
+    """Aggregate wireless clients per access point MAC address.
+
+    Values are "rssi", "satisfaction", "rx_bytes_r" and "tx_bytes_r".
+    """
+    return Aggregation(
+        clients,
+        lambda obj_id, client: client.access_point_mac or None,
+        {
+            "rssi": "rssi",
+            "satisfaction": "satisfaction",
+            "rx_bytes_r": "rx_bytes_r",
+            "tx_bytes_r": "tx_bytes_r",
+        },
+    )
+
+
+def switch_clients(clients: Clients) -> Aggregation[Client]:
+    """Aggregate wired clients per switch MAC address.
+
+    Values are "rx_bytes_r" and "tx_bytes_r".
+    """
+    return Aggregation(
+        clients,
+        lambda obj_id, client: (client.is_wired and client.switch_mac) or None,
+        {
+            "rx_bytes_r": "wired_rx_bytes_r",
+            "tx_bytes_r": "wired_tx_bytes_r",
+        },
+    )
+
+
+def switch_poe_power(ports: Ports) -> Aggregation[Port]:
+    """Aggregate ports per device MAC address.
+
+    Values are "poe_power" in watts, ports without PoE power have no value.
+    """
+    return Aggregation(
+        ports,
+        lambda obj_id, port: obj_id.rpartition("_")[0] or None,
+        {"poe_power": lambda port: _float(port.poe_power)},
+    )
+
+
+def device_models(devices: Devices) -> Aggregation[Device]:
+    """Aggregate devices per model.
+
+    Values are "num_sta" and "uptime".
+    """
+    return Aggregation(
+        devices,
+        lambda obj_id, device: device.model or None,
+        {
+            "num_sta": "num_sta",
+            "uptime": "uptime",
+        },
+    )
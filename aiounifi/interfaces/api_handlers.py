@@ -3,12 +3,16 @@
 from __future__ import annotations
 
 from abc import ABC
-from collections import UserDict, defaultdict
-from dataclasses import dataclass
+import asyncio
+from collections import UserDict
+from collections.abc import Iterable
+from dataclasses import dataclass, field
 import enum
+import time
 from typing import TYPE_CHECKING, Any, Protocol, final
 
-from ..models.api import ApiItem, ApiResponse, Endpoint
+from ..models.api import ApiItem, ApiResponse, Endpoint, RawMode
+from ..models.columns import to_columns
 
 if TYPE_CHECKING:
     from ..client import UnifiClient
@@ -25,6 +29,9 @@ class ItemEvent(enum.Enum):
 
 ID_FILTER_ALL = "*"
 
+EVENT_MASKS = {event: 1 << index for index, event in enumerate(ItemEvent)}
+EVENT_MASK_ALL = sum(EVENT_MASKS.values())
+
 
 class Callback(Protocol):
     """An event callback."""
@@ -32,6 +39,12 @@ class Callback(Protocol):
     def __call__(self, event: ItemEvent, obj_id: str) -> None: ...  # noqa: D102
 
 
+class ChangeCallback(Protocol):
+    """A callback for changed items, with the names of the changed fields."""
+
+    def __call__(self, obj_id: str, changed_fields: frozenset[str]) -> None: ...  # noqa: D102
+
+
 class Unsubscribe(Protocol):
     """Remove a event callback from the subscription handler."""
 
@@ -44,6 +57,58 @@ class Subscription:
 
     callback: Callback
     event_filter: set[ItemEvent] | None
+    event_mask: int = field(init=False)
+
+    def __post_init__(self) -> None:
+        """Precompute the event filter as a bitmask of EVENT_MASKS."""
+        if self.event_filter is None:
+            self.event_mask = EVENT_MASK_ALL
+        else:
+            self.event_mask = sum(EVENT_MASKS[event] for event in self.event_filter)
+
+
+@dataclass
+class ChangeSubscription:
+    """A subscription for the changed fields of items."""
+
+    callback: ChangeCallback
+    fields: frozenset[str] | None
+
+
+def _add_subscription[S](
+    subscribers: dict[str, tuple[S, ...]], id_filter: tuple[str, ...], subscription: S
+) -> Unsubscribe:
+    """Add subscription for the ids of id_filter, return how to remove it.
+
+    Subscriptions are stored as tuples that are replaced rather than mutated,
+    so signalling can iterate them directly even if a callback subscribes or
+    unsubscribes. Only ids with subscriptions are present in the mapping.
+    """
+    for obj_id in id_filter:
+        subscribers[obj_id] = (*subscribers.get(obj_id, ()), subscription)
+
+    def unsubscribe() -> None:
+        for obj_id in id_filter:
+            current = subscribers.get(obj_id, ())
+            if subscription not in current:
+                continue
+            if remaining := tuple(
+                subscriber for subscriber in current if subscriber is not subscription
+            ):
+                subscribers[obj_id] = remaining
+            else:
+                del subscribers[obj_id]
+
+    return unsubscribe
+
+
+def _index_key(item: ApiItem, attributes: tuple[str, ...]) -> Any:
+    """Return the secondary index key of item, None if it shouldn't be indexed."""
+    if len(attributes) == 1:
+        key = getattr(item, attributes[0], None)
+        return None if key is None or key == "" else key
+    key = tuple(getattr(item, attribute, None) for attribute in attributes)
+    return None if None in key or "" in key else key
 
 
 class SubscriptionHandler(ABC):
@@ -52,19 +117,19 @@ class SubscriptionHandler(ABC):
     def __init__(self) -> None:
         """Initialize subscription handler."""
         super().__init__()
-        self._subscribers: dict[str, list[Subscription]] = defaultdict(list)
+        self._subscribers: dict[str, tuple[Subscription, ...]] = {}
 
     def signal_subscribers(self, event: ItemEvent, obj_id: str) -> None:
         """Signal subscribers."""
-        subscribers: list[Subscription] = (
-            self._subscribers[obj_id] + self._subscribers[ID_FILTER_ALL]
-        )
-        for subscriber in subscribers:
-            if subscriber.event_filter is None or event in subscriber.event_filter:
-                subscriber.callback(
-                    event,
-                    obj_id,
-                )
+        event_mask = EVENT_MASKS[event]
+        if subscribers := self._subscribers.get(obj_id):
+            for subscriber in subscribers:
+                if subscriber.event_mask & event_mask:
+                    subscriber.callback(event, obj_id)
+        if subscribers := self._subscribers.get(ID_FILTER_ALL):
+            for subscriber in subscribers:
+                if subscriber.event_mask & event_mask:
+                    subscriber.callback(event, obj_id)
 
     def subscribe(
         self,
@@ -86,18 +151,7 @@ class SubscriptionHandler(ABC):
         elif isinstance(id_filter, str):
             id_filter = (id_filter,)
 
-        for obj_id in id_filter:
-            self._subscribers[obj_id].append(subscription)
-
-        def unsubscribe() -> None:
-            for obj_id in id_filter:
-                if subscription not in self._subscribers[obj_id]:
-                    continue
-                self._subscribers[obj_id].remove(subscription)
-                if not self._subscribers[obj_id]:
-                    del self._subscribers[obj_id]
-
-        return unsubscribe  # type: ignore
+        return _add_subscription(self._subscribers, id_filter, subscription)
 
 
 class APIHandler[T: ApiItem](SubscriptionHandler, UserDict[str, T]):
@@ -114,25 +168,92 @@ class APIHandler[T: ApiItem](SubscriptionHandler, UserDict[str, T]):
     update_endpoint: Endpoint | None = None
     delete_endpoint: Endpoint | None = None
 
+    remove_stale_items: bool = False
+    """Remove items missing from the list endpoint response when updating."""
+
+    secondary_indexes: dict[str, tuple[str, ...]] = {}
+    """Index name mapped to the item attributes making up its key."""
+
     def __init__(self, client: UnifiClient) -> None:
         """Initialize API handler."""
         super().__init__()
         self.client = client
+        self._change_subscribers: dict[str, tuple[ChangeSubscription, ...]] = {}
+        self._generation = 0
+        self._update_task: asyncio.Task[int | None] | None = None
+        self._updated_at: float | None = None
+        # Kept keyed by the str object ids like the items. Dicts with only str
+        # keys use a smaller entry layout and str caches its hash, so integer
+        # MAC keys would neither save memory nor speed up lookups.
+        self._generations: dict[str, int] = {}
+        self._indexes: dict[str, dict[Any, dict[str, None]]] = {
+            name: {} for name in self.secondary_indexes
+        }
+        self._index_keys: dict[str, tuple[Any, ...]] = {}
 
         if message_filter := self.process_messages + self.remove_messages:
             client.messages.subscribe(self.process_message, message_filter)
 
     @final
-    async def update(self) -> None:  # type: ignore
-        """Refresh data."""
+    async def update(  # type: ignore
+        self, remove_stale: bool | None = None, max_age: float | None = None
+    ) -> None:
+        """Refresh data.
+
+        Calls made while a refresh is in flight share its request and
+        processing. With "max_age" the refresh is skipped if data was refreshed
+        at most that many seconds ago.
+
+        With "remove_stale", defaulting to "remove_stale_items", items that are
+        not part of the response are removed and DELETED is signalled for them.
+        """
         if self.list_endpoint is None:
             raise NotImplementedError(
                 f"{self.__class__.__name__} does not implement a list endpoint."
             )
+        if (
+            max_age is not None
+            and self._updated_at is not None
+            and time.monotonic() - self._updated_at <= max_age
+        ):
+            return
 
-        response = await self.client.get(self.list_endpoint)
-        if response:
-            self.process_raw(response.data)
+        if self._update_task is None:
+            self._update_task = asyncio.create_task(self._refresh(self.list_endpoint))
+        # Shielded so a cancelled caller doesn't cancel the refresh of others.
+        generation = await asyncio.shield(self._update_task)
+        if generation is not None and (
+            self.remove_stale_items if remove_stale is None else remove_stale
+        ):
+            self.remove_stale(generation)
+
+    async def _refresh(self, endpoint: Endpoint) -> int | None:
+        """Request and process all items, return the generation of the refresh.
+
+        The generation starts before the request is sent, so items stored while
+        it is in flight count as fresh.
+        """
+        self._generation += 1
+        generation = self._generation
+        try:
+            response = await self.client.get(endpoint)
+        finally:
+            self._update_task = None
+        if not response:
+            return None
+        self.process_raw(response.data)
+        self._updated_at = time.monotonic()
+        return generation
+
+    def remove_stale(self, generation: int) -> None:
+        """Remove items not stored or refreshed since generation started."""
+        stale = [
+            obj_id
+            for obj_id, item_generation in self._generations.items()
+            if item_generation < generation
+        ]
+        for obj_id in stale:
+            del self[obj_id]
 
     async def save(self, api_item: T, fields: set[str] | None = None) -> ApiResponse:
         """Save a previously created api item."""
@@ -166,20 +287,221 @@ class APIHandler[T: ApiItem](SubscriptionHandler, UserDict[str, T]):
         if self.obj_id_key not in raw:
             return
 
-        self[raw[self.obj_id_key]] = self.item_cls.from_json(data=raw)
+        obj_id = raw[self.obj_id_key]
+        if self.is_unchanged(obj_id, raw):
+            return
+
+        self[obj_id] = self.item_cls.from_json(data=raw)
+
+    def use_compact_items(
+        self,
+        raw_mode: RawMode = RawMode.FULL,
+        projection: Iterable[str] | None = None,
+    ) -> None:
+        """Store items processed from now on as compact variants of item_cls.
+
+        Compact items use slots and retain raw data according to raw_mode, and
+        with a projection only decode and store the named fields, see
+        ApiItem.compact. Payloads can only be detected as unchanged with full
+        raw data and secondary indexes on fields outside the projection stay
+        empty, as do ports and outlets of devices projected without their
+        tables.
+        """
+        self.item_cls = self.item_cls.compact(raw_mode, projection)
+
+    def is_unchanged(self, obj_id: str, raw: dict[str, Any]) -> bool:
+        """Check if the stored item was created from an identical payload.
+
+        Periodic refreshes and sync messages frequently repeat the previous
+        payload, comparing the raw data avoids rebuilding the item and signalling
+        subscribers about a change that didn't happen. An unchanged item counts
+        as refreshed by the ongoing update. Stored items are therefore not to be
+        edited in place.
+        """
+        if (item := self.data.get(obj_id)) is None:
+            return False
+        if getattr(item, "raw", None) != raw:
+            return False
+        self._generations[obj_id] = self._generation
+        return True
+
+    def is_unchanged_item(self, obj_id: str, item: T) -> bool:
+        """Check if the stored item has the same data as an item decoded elsewhere.
+
+        Used for items decoded as part of another item, like the ports of a
+        device. Equal raw data only shows an unchanged item if both items retain
+        it in full, otherwise the field values are compared as well.
+        """
+        if (stored := self.data.get(obj_id)) is None:
+            return False
+        if getattr(stored, "raw", None) != item.raw:
+            return False
+        if (
+            type(item).raw_mode is not RawMode.FULL
+            or type(stored).raw_mode is not RawMode.FULL
+        ) and item.diff(stored):
+            return False
+        self._generations[obj_id] = self._generation
+        return True
+
+    def lookup(self, index: str, *values: Any) -> list[T]:
+        """Return items matching values on the attributes of a secondary index."""
+        key = values[0] if len(values) == 1 else values
+        return [self.data[obj_id] for obj_id in self._indexes[index].get(key, ())]
+
+    def snapshot(
+        self, field_names: Iterable[str], use_numpy: bool | None = None
+    ) -> dict[str, Any]:
+        """Return the named fields of all items as columns, see to_columns.
+
+        Column rows follow the iteration order of the handler.
+        """
+        return to_columns(self.item_cls, self.data.values(), field_names, use_numpy)
+
+    def _update_indexes(self, obj_id: str, new: T | None) -> None:
+        """Move obj_id between secondary index keys as the item changes.
+
+        The index keys an item is stored under are kept per item, so an item
+        edited in place is still removed from the right index keys. Items with an
+        empty value for any attribute of an index are not indexed.
+        """
+        old_keys = self._index_keys.pop(obj_id, None)
+        if new is not None:
+            new_keys = self._index_keys[obj_id] = tuple(
+                _index_key(new, attributes)
+                for attributes in self.secondary_indexes.values()
+            )
+        for position, index in enumerate(self._indexes.values()):
+            old_key = None if old_keys is None else old_keys[position]
+            new_key = None if new is None else new_keys[position]
+            if old_key == new_key:
+                continue
+            if old_key is not None:
+                obj_ids = index[old_key]
+                del obj_ids[obj_id]
+                if not obj_ids:
+                    del index[old_key]
+            if new_key is not None:
+                index.setdefault(new_key, {})[obj_id] = None
+
+    def subscribe_changes(
+        self,
+        callback: ChangeCallback,
+        field_filter: tuple[str, ...] | str | None = None,
+        id_filter: tuple[str] | str | None = None,
+    ) -> Unsubscribe:
+        """Subscribe to changed items together with the names of the changed fields.
+
+        The changed fields are only computed while there are change subscribers,
+        once per update and shared by all of them. With a field filter the
+        callback is only called if one of those fields changed. Change
+        subscribers are called after the subscribers of the CHANGED event.
+        """
+        if isinstance(field_filter, str):
+            field_filter = (field_filter,)
+        subscription = ChangeSubscription(
+            callback=callback,
+            fields=None if field_filter is None else frozenset(field_filter),
+        )
+
+        if id_filter is None:
+            id_filter = (ID_FILTER_ALL,)
+        elif isinstance(id_filter, str):
+            id_filter = (id_filter,)
+
+        return _add_subscription(self._change_subscribers, id_filter, subscription)
+
+    def signal_changes(self, obj_id: str, changed_fields: frozenset[str]) -> None:
+        """Signal change subscribers about the changed fields of obj_id."""
+        if subscribers := self._change_subscribers.get(obj_id):
+            for subscriber in subscribers:
+                if subscriber.fields is None or not subscriber.fields.isdisjoint(
+                    changed_fields
+                ):
+                    subscriber.callback(obj_id, changed_fields)
+        if subscribers := self._change_subscribers.get(ID_FILTER_ALL):
+            for subscriber in subscribers:
+                if subscriber.fields is None or not subscriber.fields.isdisjoint(
+                    changed_fields
+                ):
+                    subscriber.callback(obj_id, changed_fields)
 
     def __setitem__(self, key, item):
         """Set the handler's collection key to item."""
         changed = key in self
+        changed_fields = (
+            item.diff(self.data[key])
+            if changed and self._change_subscribers
+            else frozenset()
+        )
+        if self._indexes:
+            self._update_indexes(key, item)
         super().__setitem__(key, item)
+        self._generations[key] = self._generation
         self.signal_subscribers(
             ItemEvent.CHANGED if changed else ItemEvent.ADDED,
             key,
         )
+        if changed_fields:
+            self.signal_changes(key, changed_fields)
 
     def __delitem__(self, obj_id: str):
         """If obj_id is in the dictionary, remove it and signal subscribers."""
         item = self.get(obj_id)
         if item is not None:
+            if self._indexes:
+                self._update_indexes(obj_id, None)
             super().__delitem__(obj_id)
+            self._generations.pop(obj_id, None)
             self.signal_subscribers(ItemEvent.DELETED, obj_id)
+
+
+class DeviceTableHandler[T: ApiItem](APIHandler[T]):
+    """Base class for items decoded from a table of each device, like its ports."""
+
+    table_name: str
+    """Name of the device field holding the table of items."""
+
+    def __init__(self, client: UnifiClient) -> None:
+        """Initialize API handler."""
+        super().__init__(client)
+        self._device_items: dict[str, dict[str, None]] = {}
+        self._device_tables: dict[str, list[dict[str, Any]]] = {}
+        client.devices.subscribe(self.process_device)
+
+    def item_id(self, device_id: str, item: T) -> str | None:
+        """Return the object id of an item of the device, None to skip it."""
+        raise NotImplementedError
+
+    def process_device(self, event: ItemEvent, obj_id: str) -> None:
+        """Add, update, remove.
+
+        Only the items of the device are touched and items with unchanged data
+        are not signalled again. A table with unchanged raw data isn't decoded
+        at all. Devices projected without the table have no items.
+        """
+        previous_item_ids = self._device_items.pop(obj_id, {})
+        previous_table = self._device_tables.pop(obj_id, None)
+        item_ids: dict[str, None] = {}
+        if event in (ItemEvent.ADDED, ItemEvent.CHANGED):
+            device = self.client.devices[obj_id]
+            if self.table_name in device._api_item_field_names():
+                if (raw_table := device.raw.get(self.table_name)) is not None:
+                    self._device_tables[obj_id] = raw_table
+                    if raw_table == previous_table:
+                        # Leave the table of the device undecoded
+                        if previous_item_ids:
+                            self._device_items[obj_id] = previous_item_ids
+                        return
+                for item in getattr(device, self.table_name):
+                    if (item_id := self.item_id(obj_id, item)) is None:
+                        continue
+                    item_ids[item_id] = None
+                    if not self.is_unchanged_item(item_id, item):
+                        self[item_id] = item
+                if item_ids:
+                    self._device_items[obj_id] = item_ids
+
+        for item_id in previous_item_ids:
+            if item_id not in item_ids:
+                self.pop(item_id, None)
@@ -14,6 +14,12 @@ class Clients(APIHandler[Client]):
     process_messages = (MessageKey.CLIENT,)
     remove_messages = (MessageKey.CLIENT_REMOVED,)
     list_endpoint = ApiEndpoint(path="/stat/sta")
+    secondary_indexes = {
+        "ip": ("ip",),
+        "hostname": ("hostname",),
+        "switch_port": ("switch_mac", "switch_port"),
+        "access_point": ("access_point_mac",),
+    }
 
     async def block(self, mac: str) -> ApiResponse:
         """Block client from controller."""
@@ -4,6 +4,7 @@ Access points, gateways, power plugs, switches.
 """
 
 from collections.abc import Sequence
+from copy import copy
 import re
 from typing import cast
 
@@ -18,27 +19,37 @@ def _merge_overrides(
     new_overrides: Sequence[DeviceOutletOverrides | DevicePortOverrides],
     index_attr: str,
 ):
+    """Merge new overrides into the existing overrides ordered by index_attr.
+
+    Existing overrides are updated with the non-None values of new overrides with
+    the same index, other new overrides are inserted in order. Both sequences are
+    walked once.
+    """
     merged_overrides: list[DeviceOutletOverrides | DevicePortOverrides] = []
     sorted_overrides = sorted(
         new_overrides, key=lambda override: getattr(override, index_attr)
     )
+    position, count = 0, len(sorted_overrides)
     for override in existing_overrides:
         existing_index = getattr(override, index_attr)
-        if sorted_overrides:
-            new_index = getattr(sorted_overrides[0], index_attr)
-            if existing_index == new_index:
-                merged_overrides.append(override.replace(sorted_overrides[0]))
-                sorted_overrides = sorted_overrides[1:]
-            elif new_index < existing_index:
-                merged_overrides.append(sorted_overrides[0])
-                merged_overrides.append(override)
-                sorted_overrides = sorted_overrides[1:]
-            else:
-                merged_overrides.append(override)
-        else:
-            merged_overrides.append(override)
-    if len(sorted_overrides) > 0:
-        merged_overrides.extend(sorted_overrides)
+        while (
+            position < count
+            and getattr(sorted_overrides[position], index_attr) < existing_index
+        ):
+            merged_overrides.append(sorted_overrides[position])
+            position += 1
+        start = position
+        while (
+            position < count
+            and getattr(sorted_overrides[position], index_attr) == existing_index
+        ):
+            position += 1
+        merged_overrides.append(
+            override.replace(*sorted_overrides[start:position])
+            if position > start
+            else override
+        )
+    merged_overrides.extend(sorted_overrides[position:])
     return merged_overrides
 
 
@@ -50,6 +61,10 @@ class Devices(APIHandler[Device]):
     process_messages = (MessageKey.DEVICE,)
     list_endpoint = ApiEndpoint(path="/stat/device")
     update_endpoint = ApiEndpoint(path="/rest/device/{api_item._id}")
+    secondary_indexes = {
+        "id": ("_id",),
+        "ip": ("ip",),
+    }
 
     async def power_cycle_port(self, device: Device, port_idx: int) -> ApiResponse:
         """Power cycle a POE port."""
@@ -78,8 +93,12 @@ class Devices(APIHandler[Device]):
         brightness: int | None = None,
         color: str | None = None,
     ):
-        """Set LED status of device."""
+        """Set LED status of device.
+
+        The stored device is only updated from the response of the controller.
+        """
         updated_fields = {"led_override"}
+        device = copy(device)
         device.led_override = status
         if device.supports_led_ring:
             # Validate brightness parameter
@@ -109,6 +128,7 @@ class Devices(APIHandler[Device]):
 
         Any existing overrides will be updated with the non-None values given in the override.
         """
+        device = copy(device)
         device.outlet_overrides = cast(
             list[DeviceOutletOverrides],
             _merge_overrides(device.outlet_overrides, overrides, "index"),
@@ -122,6 +142,7 @@ class Devices(APIHandler[Device]):
 
         Any existing overrides will be updated with the non-None values given in the override.
         """
+        device = copy(device)
         device.port_overrides = cast(
             list[DevicePortOverrides],
             _merge_overrides(device.port_overrides, overrides, "port_idx"),
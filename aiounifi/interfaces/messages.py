@@ -5,9 +5,10 @@ from __future__ import annotations
 from collections.abc import Callable
 import json
 import logging
+import re
 from typing import TYPE_CHECKING, Any
 
-from ..models.message import Message, MessageKey
+from ..models.message import Message, MessageKey, Meta
 
 if TYPE_CHECKING:
     from ..client import UnifiClient
@@ -19,6 +20,26 @@ SubscriptionCallback = Callable[[Message], None]
 SubscriptionType = tuple[SubscriptionCallback, tuple[MessageKey, ...] | None]
 UnsubscribeType = Callable[[], None]
 
+# Matches frames starting with a flat meta object, e.g.
+# {"meta": {"rc": "ok", "message": "sta:sync"}, "data": [...]}
+META_MESSAGE_PATTERN = r'\s*\{\s*"meta"\s*:\s*\{[^{}]*?"message"\s*:\s*"([^"\\]*)"'
+META_MESSAGE = re.compile(META_MESSAGE_PATTERN)
+META_MESSAGE_BYTES = re.compile(META_MESSAGE_PATTERN.encode())
+
+
+def peek_message_key(raw: str | bytes) -> MessageKey | None:
+    """Extract the message key from the meta header without decoding the frame.
+
+    Return None if the frame does not start with a meta object that can be
+    matched cheaply, in which case the frame needs to be fully decoded.
+    """
+    if isinstance(raw, str):
+        if match := META_MESSAGE.match(raw):
+            return MessageKey(match.group(1))
+    elif match_bytes := META_MESSAGE_BYTES.match(raw):
+        return MessageKey(match_bytes.group(1).decode())
+    return None
+
 
 class MessageHandler:
     """Message handler class."""
@@ -27,7 +48,7 @@ class MessageHandler:
         """Initialize message handler class."""
         self.controller = controller
         self._subscribers: list[SubscriptionType] = []
-        self._subscribed_messages: set[MessageKey] = set()
+        self._dispatch: dict[MessageKey, tuple[SubscriptionCallback, ...]] = {}
 
     def subscribe(
         self,
@@ -42,21 +63,49 @@ class MessageHandler:
         if isinstance(message_filter, MessageKey):
             message_filter = (message_filter,)
 
-        if message_filter is not None:
-            self._subscribed_messages.update(message_filter)
-
         subscription = (callback, message_filter)
         self._subscribers.append(subscription)
+        self._update_dispatch()
 
         def unsubscribe() -> None:
             self._subscribers.remove(subscription)
+            self._update_dispatch()
 
         return unsubscribe
 
+    def _update_dispatch(self) -> None:
+        """Rebuild the callbacks to signal per message key.
+
+        Only message keys with a subscriber filtering on them are dispatched,
+        subscribers without a filter receive all of those messages. Callbacks
+        are kept in subscription order.
+        """
+        message_keys = {
+            message_key
+            for _, message_filter in self._subscribers
+            if message_filter is not None
+            for message_key in message_filter
+        }
+        self._dispatch = {
+            message_key: tuple(
+                callback
+                for callback, message_filter in self._subscribers
+                if message_filter is None or message_key in message_filter
+            )
+            for message_key in message_keys
+        }
+
     def new_data(self, raw_bytes: bytes) -> None:
-        """Convert bytes data into parseable JSON data.."""
+        """Convert bytes data into parseable JSON data..
+
+        Frames of message types nobody subscribes to are dropped before decoding.
+        """
+        if (
+            message_key := peek_message_key(raw_bytes)
+        ) is not None and message_key not in self._dispatch:
+            return
         try:
-            self.handler(json.loads(raw_bytes))
+            self.handler(self.controller.config.codec.loads(raw_bytes))
         except json.JSONDecodeError:
             LOGGER.debug("Bad JSON data '%s'", raw_bytes)
 
@@ -65,23 +114,17 @@ class MessageHandler:
         if "meta" not in raw or "data" not in raw:
             return
 
+        meta = Meta.from_dict(raw["meta"])
+        if meta.message is MessageKey.UNKNOWN:
+            LOGGER.warning("Unsupported message %s", raw)
+
+        if (callbacks := self._dispatch.get(meta.message)) is None:
+            return
+
         for raw_data in raw["data"]:
-            data = Message.from_dict(
-                {
-                    "meta": raw["meta"],
-                    "data": raw_data,
-                }
-            )
-            if data.meta.message not in self._subscribed_messages:
-                break
-
-            for callback, message_filter in self._subscribers:
-                if (
-                    message_filter is not None
-                    and data.meta.message not in message_filter
-                ):
-                    continue
-                callback(data)
+            message = Message(meta=meta, data=raw_data)
+            for callback in callbacks:
+                callback(message)
 
     def __len__(self) -> int:
         """List number of message subscribers."""
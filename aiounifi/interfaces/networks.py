@@ -16,6 +16,8 @@ class Networks(APIHandler[NetworkConf]):
 
     def process_item(self, raw: dict[str, Any]):
         """Process the item and add a CorporateNetworkConf or WanNetworkConf object to the handler."""
+        if self.is_unchanged(raw.get(self.obj_id_key, ""), raw):
+            return
         if "purpose" in raw:
             if raw["purpose"] == "corporate":
                 self[raw[self.obj_id_key]] = CorporateNetworkConf.from_json(data=raw)
@@ -1,14 +1,20 @@
 """API management class and base class for the different end points."""
 
 from abc import ABC
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
 import contextlib
-from copy import deepcopy
-from dataclasses import dataclass, field, fields
-from types import UnionType
+from copy import copy
+from dataclasses import MISSING, Field, dataclass, field, fields, make_dataclass
+import enum
+from functools import reduce
+import operator
+import sys
+from types import MappingProxyType, UnionType
 from typing import (
     Any,
+    ClassVar,
     Protocol,
+    Self,
     TypeVar,
     get_args,
     get_origin,
@@ -22,6 +28,8 @@ class Endpoint:
 
     path: str
     version: int = 1
+    idempotent: bool | None = None
+    """If requests can be retried, None to decide by request method."""
 
     def format(self, *args: object, **kwargs: object) -> str:
         """Format the endpoint path to produce a complete path.
@@ -55,7 +63,7 @@ class ApiResponse:
     data: list[dict[str, Any]] = field(default_factory=list)
 
 
-def _get_annotation(annotation):
+def _get_annotation(annotation: Any) -> tuple[Any, Any, tuple[Any, ...]]:
     if isinstance(annotation, UnionType):
         args = get_args(annotation)
         if len(args) == 2:
@@ -69,6 +77,452 @@ def _get_annotation(annotation):
     return annotation, get_origin(annotation), get_args(annotation)
 
 
+def _field_json_keys(api_field: Field[Any]) -> tuple[str, ...]:
+    """Return the JSON keys to look up for a field, in order of precedence."""
+    if json_key := api_field.metadata.get("json"):
+        return (json_key, api_field.name)
+    return (api_field.name,)
+
+
+_SCALAR_TYPES = (bool, float, int, str)
+_MISSING = object()
+_EMPTY_RAW: Any = MappingProxyType({})
+
+
+class RawMode(enum.Enum):
+    """Raw data retained by ApiItem instances created from JSON."""
+
+    FULL = "full"
+    """Retain the JSON data the item was created from."""
+
+    UNKNOWN = "unknown"
+    """Retain only the keys of the JSON data that aren't mapped to a field."""
+
+    NONE = "none"
+    """Don't retain any raw data."""
+
+
+def _is_lazy(cls: type["ApiItem"], api_field: Field[Any]) -> bool:
+    """Return if a field is decoded on first access for instances of cls.
+
+    Values are decoded from raw, so only classes retaining full raw data
+    decode lazily.
+    """
+    return bool(api_field.metadata.get("lazy")) and cls.raw_mode is RawMode.FULL
+
+
+class _LazyField:
+    """Decode a nested field from raw on first access and cache it on the instance.
+
+    This is a non-data descriptor, once the decoded value is stored in the
+    instance dictionary it takes precedence over the descriptor.
+    """
+
+    def __init__(
+        self,
+        api_field: Field[Any],
+        decode: Callable[[Any], Any],
+    ) -> None:
+        """Initialize the lazy field."""
+        self.name = api_field.name
+        self.json_keys = _field_json_keys(api_field)
+        self.decode = decode
+        self.default = api_field.default
+        self.default_factory = api_field.default_factory
+
+    def __get__(self, instance: Any, owner: type | None = None) -> Any:
+        """Return the decoded value from raw, or the field default."""
+        if instance is None:
+            return self
+        value = instance.__dict__[self.name] = self.decode_raw(instance)
+        return value
+
+    def raw_value(self, instance: Any) -> Any:
+        """Return the JSON value of the field in raw, _MISSING if absent."""
+        raw = instance.raw
+        for json_key in self.json_keys:
+            if json_key in raw:
+                return raw[json_key]
+        return _MISSING
+
+    def decode_raw(self, instance: Any) -> Any:
+        """Return the value decoded from raw, or the field default."""
+        if (value := self.raw_value(instance)) is not _MISSING:
+            return self.decode(value)
+        if self.default is MISSING:
+            return self.default_factory()  # type: ignore[misc]
+        return self.default
+
+
+class _LazySlot(_LazyField):
+    """Decode a nested field of a slots class on first access and cache it in its slot.
+
+    This is a data descriptor wrapping the slot, an empty slot is decoded.
+    """
+
+    def __init__(
+        self,
+        api_field: Field[Any],
+        decode: Callable[[Any], Any],
+        slot: Any,
+    ) -> None:
+        """Initialize the lazy slot."""
+        super().__init__(api_field, decode)
+        self.slot = slot
+
+    def __get__(self, instance: Any, owner: type | None = None) -> Any:
+        """Return the value in the slot, decoding it first if the slot is empty."""
+        if instance is None:
+            return self
+        try:
+            return self.slot.__get__(instance, owner)
+        except AttributeError:
+            value = self.decode_raw(instance)
+            self.slot.__set__(instance, value)
+            return value
+
+    def __set__(self, instance: Any, value: Any) -> None:
+        """Store value in the slot."""
+        self.slot.__set__(instance, value)
+
+    def __delete__(self, instance: Any) -> None:
+        """Empty the slot."""
+        self.slot.__delete__(instance)
+
+
+def _lazy_decoder(
+    api_field: Field[Any], annotation: Any, origin: Any, args: Any
+) -> Callable[[Any], Any]:
+    """Return a function decoding the JSON value of a lazy nested field."""
+    if origin is list and issubclass(args[0], ApiItem):
+        from_json = args[0].from_json
+
+        def decode_list(value: Any) -> list[Any]:
+            if not isinstance(value, list):
+                raise ValueError(
+                    f"Expected {api_field.name} to be a list but got a {type(value)}"
+                )
+            return [from_json(child) for child in value]
+
+        return decode_list
+
+    if origin is None and issubclass(annotation, ApiItem):
+        return annotation.from_json  # type: ignore[no-any-return]
+
+    raise TypeError(f"Lazy field {api_field.name} is not an ApiItem or list of them")
+
+
+def _lazy_attribute(
+    cls: type["ApiItem"], api_field: Field[Any], hint: Any
+) -> _LazyField:
+    """Set up the class attribute decoding a lazy field of cls."""
+    attribute = cls.__dict__.get(api_field.name)
+    if isinstance(attribute, _LazyField):
+        return attribute
+    decode = _lazy_decoder(api_field, *_get_annotation(hint))
+    if "__slots__" in cls.__dict__:
+        attribute = _LazySlot(api_field, decode, attribute)
+    else:
+        attribute = _LazyField(api_field, decode)
+    setattr(cls, api_field.name, attribute)
+    return attribute
+
+
+def _decoder_value_lines(
+    api_field: Field[Any], hint: Any, initializer: str, namespace: dict[str, Any]
+) -> list[str]:
+    """Return decoder source converting the JSON value of a field to its type."""
+    custom_initializer = api_field.metadata.get("custom_initializer")
+    annotation, origin, args = _get_annotation(hint)
+    lines: list[str] = []
+
+    if origin is list:
+        child_cls = args[0]
+        namespace[initializer] = (
+            child_cls.from_json if issubclass(child_cls, ApiItem) else child_cls
+        )
+        lines.append("        if not isinstance(value, list):")
+        lines.append(
+            "            raise ValueError("
+            f'f"Expected {api_field.name} to be a list but got a {{type(value)}}")'
+        )
+        lines.append(f"        value = [{initializer}(child) for child in value]")
+
+    elif origin is None and issubclass(annotation, ApiItem):
+        namespace[initializer] = annotation.from_json
+        lines.append(f"        value = {initializer}(value)")
+
+    else:
+        namespace[initializer] = custom_initializer or origin or annotation
+        if custom_initializer is None and annotation in _SCALAR_TYPES:
+            # Values already of the right type would be returned unchanged.
+            lines.append(
+                f"        if value is not None and value.__class__ is not {initializer}:"
+            )
+        else:
+            lines.append("        if value is not None:")
+        lines.append("            try:")
+        lines.append(f"                value = {initializer}(value)")
+        lines.append("            except (ValueError, TypeError):")
+        lines.append("                pass")
+
+    return lines
+
+
+def _generate_decoder(cls: type["ApiItem"]) -> Callable[[dict[str, Any]], Any]:
+    """Generate a straight-line decoder function for an ApiItem dataclass.
+
+    The generated function is equivalent to `ApiItem._from_json_generic` but has
+    the JSON key mapping, nested ApiItem and list handling and any custom
+    initializers resolved up front, so decoding an item is a single pass over
+    the known fields without any per-field lookups.
+    """
+    namespace: dict[str, Any] = {"cls": cls, "MISSING": _MISSING}
+    lines = ["def decode(data):", "    kwargs = {}"]
+    lazy_fields: dict[str, _LazyField] = {}
+
+    annotations = get_type_hints(cls)
+    for index, api_field in enumerate(fields(cls)):
+        if api_field.name == "raw":
+            continue
+
+        if _is_lazy(cls, api_field):
+            lazy_fields[api_field.name] = _lazy_attribute(
+                cls, api_field, annotations[api_field.name]
+            )
+            continue
+
+        json_keys = _field_json_keys(api_field)
+        interned = api_field.name in cls.intern_fields
+        lines.append(f"    value = data.get({json_keys[0]!r}, MISSING)")
+        if interned:
+            lines.append(f"    key = {json_keys[0]!r}")
+        for json_key in json_keys[1:]:
+            lines.append("    if value is MISSING:")
+            lines.append(f"        value = data.get({json_key!r}, MISSING)")
+            if interned:
+                lines.append(f"        key = {json_key!r}")
+        lines.append("    if value is not MISSING:")
+
+        if interned:
+            # Only JSON strings are interned, before any conversion, so raw
+            # keeps the value it was given.
+            namespace["intern"] = sys.intern
+            lines.append("        if value.__class__ is str:")
+            lines.append("            value = intern(value)")
+            if cls.raw_mode is RawMode.FULL:
+                # Let raw share the interned value rather than keep its own copy.
+                lines.append("            data[key] = value")
+
+        lines.extend(
+            _decoder_value_lines(
+                api_field, annotations[api_field.name], f"init_{index}", namespace
+            )
+        )
+
+        lines.append(f"        kwargs[{api_field.name!r}] = value")
+
+    lines.append("    instance = cls(**kwargs)")
+    # Drop the defaults set by __init__ so access falls through to _LazyField.
+    lines.extend(f"    del instance.{name}" for name in lazy_fields)
+    setattr(cls, "_api_item_lazy_fields", lazy_fields)
+    if cls.raw_mode is RawMode.FULL:
+        lines.append("    instance.raw = data")
+    else:
+        namespace["retained_raw"] = cls._api_item_retained_raw
+        lines.append("    instance.raw = retained_raw(data)")
+    lines.append("    return instance")
+
+    source = "\n".join(lines)
+    exec(compile(source, f"<{cls.__qualname__} decoder>", "exec"), namespace)
+    return namespace["decode"]  # type: ignore[no-any-return]
+
+
+def _generate_encoder(
+    cls: type["ApiItem"], output_fields: frozenset[str] | None
+) -> Callable[["ApiItem"], dict[str, Any]]:
+    """Generate an encoder function for an ApiItem dataclass and set of output fields.
+
+    The generated function is equivalent to `ApiItem._to_json_generic`. Only the
+    requested fields are visited and, when a field subset is given, only the
+    matching raw keys are copied instead of the whole raw dictionary.
+    """
+    namespace: dict[str, Any] = {"ApiItem": ApiItem}
+    lines = ["def encode(self):", "    raw = self.raw"]
+
+    if output_fields is None:
+        lines.append("    data = dict(raw)")
+    else:
+        lines.append("    data = {}")
+        for key in sorted(output_fields):
+            lines.append(f"    if {key!r} in raw:")
+            lines.append(f"        data[{key!r}] = raw[{key!r}]")
+
+    annotations = get_type_hints(cls)
+    for api_field in fields(cls):
+        if api_field.name == "raw" or (
+            output_fields is not None and api_field.name not in output_fields
+        ):
+            continue
+
+        json_key = api_field.metadata.get("json") or api_field.name
+        annotation, origin, _ = _get_annotation(annotations[api_field.name])
+        lines.append(f"    value = self.{api_field.name}")
+
+        if origin is None and (
+            annotation in _SCALAR_TYPES
+            or (isinstance(annotation, type) and issubclass(annotation, enum.Enum))
+        ):
+            lines.append("    if value is not None:")
+            lines.append(f"        data[{json_key!r}] = value")
+            continue
+
+        lines.append("    if isinstance(value, ApiItem):")
+        lines.append(f"        data[{json_key!r}] = value.to_json()")
+        lines.append(
+            "    elif isinstance(value, list) and value and isinstance(value[0], ApiItem):"
+        )
+        lines.append(f"        data[{json_key!r}] = [item.to_json() for item in value]")
+        lines.append("    elif value is not None:")
+        lines.append(f"        data[{json_key!r}] = value")
+
+    lines.append("    return data")
+
+    source = "\n".join(lines)
+    exec(compile(source, f"<{cls.__qualname__} encoder>", "exec"), namespace)
+    return namespace["encode"]  # type: ignore[no-any-return]
+
+
+_MAX_ENCODERS = 64
+
+# Class attributes that describe the class itself rather than its behaviour.
+_COMPACT_SKIPPED_ATTRIBUTES = frozenset(
+    {
+        "__annotate__",
+        "__annotations__",
+        "__dataclass_fields__",
+        "__dataclass_params__",
+        "__dict__",
+        "__firstlineno__",
+        "__match_args__",
+        "__module__",
+        "__qualname__",
+        "__slots__",
+        "__static_attributes__",
+        "__weakref__",
+        "__abstractmethods__",
+        "_abc_impl",
+        # Generated by dataclass, generated again for the fields of the variant.
+        "__eq__",
+        "__hash__",
+        "__init__",
+        "__replace__",
+    }
+)
+
+
+def _compact_annotation(annotation: Any, raw_mode: "RawMode") -> Any:
+    """Return annotation with any ApiItem replaced by its compact variant."""
+    if isinstance(annotation, type) and issubclass(annotation, ApiItem):
+        return annotation.compact(raw_mode)
+    if isinstance(annotation, UnionType):
+        return reduce(
+            operator.or_,
+            (_compact_annotation(arg, raw_mode) for arg in get_args(annotation)),
+        )
+    if get_origin(annotation) is list:
+        return list[_compact_annotation(get_args(annotation)[0], raw_mode)]  # type: ignore[misc]
+    return annotation
+
+
+class _UnprojectedField:
+    """Raise a clear error when accessing a field left out of a projection."""
+
+    def __init__(self, name: str, cls: type["ApiItem"]) -> None:
+        """Initialize the unprojected field."""
+        self.name = name
+        self.cls_name = cls.__qualname__
+
+    def __get__(self, instance: Any, owner: type | None = None) -> Any:
+        """Raise AttributeError for instances."""
+        if instance is None:
+            return self
+        raise AttributeError(
+            f"{self.cls_name}.{self.name} is not part of the field projection"
+        )
+
+
+def _make_compact(
+    cls: type["ApiItem"], raw_mode: "RawMode", projection: frozenset[str] | None
+) -> type["ApiItem"]:
+    """Create a slots dataclass with the fields and behaviour of an ApiItem class.
+
+    The variant derives directly from ApiItem so that instances don't get a
+    __dict__, methods and properties are copied from the class and its bases,
+    nested ApiItem fields use compact variants too. It is registered as a
+    virtual subclass of the class to keep isinstance checks working.
+
+    With a projection only those fields are decoded and stored, accessing other
+    fields raises AttributeError.
+    """
+    field_names = cls._api_item_field_names()
+    if projection is not None and (unknown := projection.difference(field_names)):
+        raise ValueError(
+            f"{cls.__qualname__} has no fields {', '.join(sorted(unknown))}"
+        )
+
+    namespace: dict[str, Any] = {}
+    for base in reversed(cls.__mro__[: cls.__mro__.index(ApiItem)]):
+        for name, value in base.__dict__.items():
+            if (
+                name in _COMPACT_SKIPPED_ATTRIBUTES
+                or name in field_names
+                or name.startswith(("_api_item", "__api_item"))
+                # Generated __repr__ is wrapped by a recursion guard.
+                or (name == "__repr__" and hasattr(value, "__wrapped__"))
+            ):
+                continue
+            namespace[name] = value
+    if projection is not None:
+        for name in field_names:
+            if name not in projection:
+                namespace[name] = _UnprojectedField(name, cls)
+    namespace["raw_mode"] = raw_mode
+    namespace["_api_item_original"] = cls
+
+    annotations = get_type_hints(cls)
+    compact_fields = [
+        (
+            api_field.name,
+            _compact_annotation(annotations[api_field.name], raw_mode),
+            field(
+                default=api_field.default,
+                default_factory=api_field.default_factory,
+                init=api_field.init,
+                repr=api_field.repr,
+                hash=api_field.hash,
+                compare=api_field.compare,
+                metadata=api_field.metadata,
+                kw_only=api_field.kw_only,
+            ),
+        )
+        for api_field in fields(cls)
+        if api_field.name != "raw"
+        and (projection is None or api_field.name in projection)
+    ]
+    compact_cls = make_dataclass(
+        cls.__name__,
+        compact_fields,
+        bases=(ApiItem,),
+        namespace=namespace,
+        slots=True,
+        module=cls.__module__,
+    )
+    compact_cls.__qualname__ = cls.__qualname__
+    cls.register(compact_cls)
+    return compact_cls
+
+
 class FieldProcessor(Protocol):
     """Type definition for a field processor method."""
 
@@ -78,19 +532,98 @@ class FieldProcessor(Protocol):
 ApiItem_T = TypeVar("ApiItem_T", bound="ApiItem")
 
 
-@dataclass
+@dataclass(slots=True)
 class ApiItem(ABC):
     """Base class for all end points using APIItems class."""
 
     raw: dict[str, Any] = field(init=False, compare=False)
 
+    raw_mode: ClassVar[RawMode] = RawMode.FULL
+    """Raw data retained by instances created from JSON."""
+
+    generate_decoder: ClassVar[bool] = True
+    """Decode using a generated per-class function instead of walking the fields."""
+
+    generate_encoder: ClassVar[bool] = True
+    """Encode using generated per-class functions instead of walking the fields."""
+
+    _api_item_lazy_fields: ClassVar[dict[str, _LazyField]] = {}
+    """Lazy fields by name, set when the decoder is generated."""
+
+    intern_fields: ClassVar[frozenset[str]] = frozenset()
+    """String fields with values repeated across many items, interned when decoding.
+
+    Only values that are strings in the JSON data are interned. With full raw
+    data the generated decoder stores the interned value back into the dict
+    passed to from_json, mutating it in place so raw doesn't keep a separate
+    copy.
+    """
+
+    @classmethod
+    def compact(
+        cls,
+        raw_mode: RawMode = RawMode.FULL,
+        projection: Iterable[str] | None = None,
+    ) -> type[Self]:
+        """Return a variant of the class using slots and retaining raw per raw_mode.
+
+        Instances of the variant have no __dict__, which together with retaining
+        less raw data reduces the memory used by high-cardinality items. The
+        variant passes isinstance checks against the class. Unchanged payload
+        detection and unknown keys on encode rely on the full raw data.
+
+        A projection limits the variant to the named fields, the other fields
+        aren't decoded nor stored and raise AttributeError on access.
+        """
+        original = cls.__dict__.get("_api_item_original", cls)
+        key = (raw_mode, None if projection is None else frozenset(projection))
+        try:
+            variants = original.__dict__["_api_item_compact"]
+        except KeyError:
+            variants = {}
+            setattr(original, "_api_item_compact", variants)
+        if (variant := variants.get(key)) is None:
+            variant = variants[key] = _make_compact(original, *key)
+        return variant  # type: ignore[no-any-return]
+
+    @classmethod
+    def _api_item_retained_raw(cls, data: dict[str, Any]) -> dict[str, Any]:
+        """Return the raw data to retain from the JSON data according to raw_mode."""
+        if cls.raw_mode is RawMode.FULL:
+            return data
+        if cls.raw_mode is RawMode.NONE:
+            return _EMPTY_RAW  # type: ignore[no-any-return]
+        try:
+            known_keys = cls.__dict__["__api_item_known_keys"]
+        except KeyError:
+            known_keys = frozenset(
+                json_key
+                for api_field in fields(cls)
+                if api_field.name != "raw"
+                for json_key in _field_json_keys(api_field)
+            )
+            setattr(cls, "__api_item_known_keys", known_keys)
+        return {key: value for key, value in data.items() if key not in known_keys}
+
+    @classmethod
+    def _api_item_field_names(cls) -> tuple[str, ...]:
+        """Lookup the names of the dataclass fields holding values."""
+        try:
+            return cls.__dict__["__api_item_field_names"]  # type: ignore[no-any-return]
+        except KeyError:
+            field_names = tuple(
+                api_field.name for api_field in fields(cls) if api_field.name != "raw"
+            )
+            setattr(cls, "__api_item_field_names", field_names)
+            return field_names
+
     @classmethod
     def _api_item_annotations(cls) -> dict[str, FieldProcessor]:
         """Lookup dataclass annotations and create processing methods that are used in from_json."""
 
         try:
-            return getattr(cls, "__api_item_annotations")
-        except AttributeError:
+            return cls.__dict__["__api_item_annotations"]
+        except KeyError:
             api_item_annotations = {}
             setattr(cls, "__api_item_annotations", api_item_annotations)
 
@@ -180,6 +713,18 @@ class ApiItem(ABC):
             ApiItem: An initialized ApiItem
 
         """
+        if not cls.generate_decoder:
+            return cls._from_json_generic(data)
+        try:
+            decoder = cls.__dict__["_api_item_decoder"]
+        except KeyError:
+            decoder = _generate_decoder(cls)
+            setattr(cls, "_api_item_decoder", decoder)
+        return decoder(data)  # type: ignore[no-any-return]
+
+    @classmethod
+    def _from_json_generic(cls, data: dict[str, Any]) -> "ApiItem_T":  # type: ignore
+        """Process JSON data by walking the dataclass fields of the ApiItem."""
         kwargs = {}
         for api_field in fields(cls):
             if api_field.name == "raw":
@@ -191,9 +736,13 @@ class ApiItem(ABC):
             else:
                 continue
 
+            if api_field.name in cls.intern_fields and isinstance(
+                value := kwargs[api_field.name], str
+            ):
+                kwargs[api_field.name] = sys.intern(value)
             cls._api_item_annotations()[api_field.name](kwargs)
         instance = cls(**kwargs)  # type: ignore
-        instance.raw = data
+        instance.raw = cls._api_item_retained_raw(data)
         return instance  # type: ignore
 
     def __post_init__(self):
@@ -201,18 +750,55 @@ class ApiItem(ABC):
         if not hasattr(self, "raw"):
             self.raw = {}
 
-    def replace(self, other: "ApiItem"):
-        """Create a copy of the current object replacing non-None values from other into the new object."""
-        new_item_data = {}
-        for api_field in fields(self):
-            if api_field.name == "raw":
-                continue
-            new_item_data[api_field.name] = getattr(self, api_field.name)
-            new_value = getattr(other, api_field.name, None)
-            if new_value is not None:
-                new_item_data[api_field.name] = new_value
-        new_item = self.__class__(**new_item_data)
-        new_item.raw = deepcopy(getattr(self, "raw", {}))
+    def diff(self, other: "ApiItem") -> frozenset[str]:
+        """Return the names of the fields whose values differ from other.
+
+        Lazy fields are compared on their JSON values in raw if both items have
+        one, so they aren't decoded for the comparison.
+        """
+        lazy_fields = self._api_item_lazy_fields if type(other) is type(self) else {}
+        changed = []
+        for name in self._api_item_field_names():
+            if (
+                (lazy := lazy_fields.get(name)) is not None
+                and (value := lazy.raw_value(self)) is not _MISSING
+                and (other_value := lazy.raw_value(other)) is not _MISSING
+            ):
+                if value != other_value:
+                    changed.append(name)
+            elif getattr(self, name) != getattr(other, name, _MISSING):
+                changed.append(name)
+        return frozenset(changed)
+
+    def replace(self, *others: "ApiItem"):
+        """Create a copy of the current object replacing non-None values from others into the new object.
+
+        Others are applied in order, so several patches can be combined in a
+        single copy. Only the replaced values are set on a shallow copy, other
+        values and the raw data are shared with the current object. The raw data
+        is only read when encoding, where field values take precedence over it,
+        and for lazy fields, whose raw values are left out of the copy if
+        replaced.
+        """
+        new_item = copy(self)
+        field_names = self._api_item_field_names()
+        for other in others:
+            for name in field_names:
+                if (new_value := getattr(other, name, None)) is not None:
+                    setattr(new_item, name, new_value)
+        if lazy_fields := self._api_item_lazy_fields:
+            replaced_keys = {
+                json_key
+                for name, lazy in lazy_fields.items()
+                if any(getattr(other, name, None) is not None for other in others)
+                for json_key in lazy.json_keys
+            }
+            if replaced_keys:
+                new_item.raw = {
+                    key: value
+                    for key, value in self.raw.items()
+                    if key not in replaced_keys
+                }
         return new_item
 
     def to_json(self, output_fields: set[str] | None = None) -> dict[str, Any]:
@@ -223,10 +809,34 @@ class ApiItem(ABC):
         metadata provided in the dataclass field. If the ApiItem is not a dataclass
         then it is returned unchanged.
 
+        Encoders are generated and cached per class and set of output fields, so
+        repeatedly saving the same fields only visits those fields and the matching
+        raw keys.
+
         Returns:
             dict[str, Any]: A dictionary that can be serialized as json
 
         """
+        cls = self.__class__
+        if not cls.generate_encoder:
+            return self._to_json_generic(output_fields)
+
+        key = None if output_fields is None else frozenset(output_fields)
+        try:
+            encoders = cls.__dict__["_api_item_encoders"]
+        except KeyError:
+            encoders = {}
+            setattr(cls, "_api_item_encoders", encoders)
+        try:
+            encoder = encoders[key]
+        except KeyError:
+            if len(encoders) >= _MAX_ENCODERS:
+                encoders.clear()
+            encoder = encoders[key] = _generate_encoder(cls, key)
+        return encoder(self)  # type: ignore[no-any-return]
+
+    def _to_json_generic(self, output_fields: set[str] | None = None) -> dict[str, Any]:
+        """Generate a JSON dictionary by walking the dataclass fields of the ApiItem."""
         data = {}
         api_item_fields = [
             api_field
@@ -262,6 +872,7 @@ class ApiItem(ABC):
 def json_field(
     json_key: str | None = None,
     custom_initializer: Callable[[Any], Any] | None = None,
+    lazy: bool = False,
     **kwargs,
 ):
     """Return a dataclass field with json metadata.
@@ -274,6 +885,9 @@ def json_field(
     Args:
         json_key (str | None): The json object key to translate
         custom_initializer (Callable | None): A callable that is used for type conversion.
+        lazy (bool): Decode a nested ApiItem or list of ApiItems from raw on first
+            access instead of when the object is created from JSON. Classes not
+            retaining full raw data decode the field right away.
         kwargs (dict, Any): Keyword arguments passed along to the dataclass.field
             method. The most common is the `default` argument.
 
@@ -281,9 +895,11 @@ def json_field(
         Field: The initialized dataclass field
 
     """
-    metadata = {}
+    metadata: dict[str, Any] = {}
     if json_key:
         metadata["json"] = json_key
     if custom_initializer:
         metadata["custom_initializer"] = custom_initializer
+    if lazy:
+        metadata["lazy"] = True
     return field(**kwargs, metadata=metadata)
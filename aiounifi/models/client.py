@@ -9,6 +9,24 @@ from .api import ApiItem, json_field
 class Client(ApiItem):
     """Represents a client network device."""
 
+    intern_fields = frozenset(
+        {
+            "access_point_mac",
+            "bssid",
+            "essid",
+            "gw_mac",
+            "network",
+            "network_id",
+            "oui",
+            "radio",
+            "radio_name",
+            "radio_proto",
+            "site_id",
+            "switch_mac",
+            "usergroup_id",
+        }
+    )
+
     _id: str | None = None
     _is_guest_by_uap: bool | None = None
     is_guest_by_switch: bool = json_field("_is_guest_by_usw", default=False)
@@ -0,0 +1,95 @@
+"""Columnar snapshots of API item fields."""
+
+from array import array
+from collections.abc import Iterable
+from dataclasses import fields
+import math
+from operator import attrgetter
+from typing import Any, get_type_hints
+
+from .api import ApiItem
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # type: ignore[assignment]
+
+# Array type codes of the field annotations with a typed column.
+# Optional numbers are stored as doubles with NaN for missing values.
+TYPECODES: dict[Any, str] = {
+    bool: "b",
+    int: "q",
+    float: "d",
+    int | None: "d",
+    float | None: "d",
+}
+
+
+def column_typecodes(item_cls: type[ApiItem]) -> dict[str, str | None]:
+    """Return field names mapped to their array type code, None if untyped."""
+    try:
+        return item_cls.__dict__["__api_item_column_typecodes"]  # type: ignore[no-any-return]
+    except KeyError:
+        annotations = get_type_hints(item_cls)
+        typecodes = {
+            api_field.name: TYPECODES.get(annotations[api_field.name])
+            for api_field in fields(item_cls)
+            if api_field.name != "raw"
+        }
+        setattr(item_cls, "__api_item_column_typecodes", typecodes)
+        return typecodes
+
+
+def _column(values: Iterable[Any], typecode: str | None, use_numpy: bool) -> Any:
+    """Return values as a typed column, or a list if they don't fit one."""
+    if typecode is None:
+        return list(values)
+    try:
+        column = array(
+            typecode,
+            [math.nan if value is None else value for value in values]
+            if typecode == "d"
+            else values,
+        )
+    except (OverflowError, TypeError):
+        return list(values)
+    if use_numpy:
+        return np.frombuffer(column, dtype=bool if typecode == "b" else typecode)
+    return column
+
+
+def to_columns(
+    item_cls: type[ApiItem],
+    items: Iterable[ApiItem],
+    field_names: Iterable[str],
+    use_numpy: bool | None = None,
+) -> dict[str, Any]:
+    """Collect the named fields of items into one column per field.
+
+    Integer, float and boolean fields become typed arrays, as NumPy arrays if
+    "use_numpy" or by default when NumPy is installed, other fields become
+    lists. Optional numbers are stored as floats with NaN for None. A field
+    holding values that don't fit its type falls back to a list.
+    """
+    field_names = tuple(field_names)
+    typecodes = column_typecodes(item_cls)
+    if unknown := set(field_names).difference(typecodes):
+        raise ValueError(
+            f"{item_cls.__qualname__} has no fields {', '.join(sorted(unknown))}"
+        )
+    if use_numpy is None:
+        use_numpy = np is not None
+    elif use_numpy and np is None:
+        raise ValueError("NumPy is not installed")
+
+    if not field_names:
+        return {}
+    getter = attrgetter(*field_names)
+    if len(field_names) == 1:
+        rows: list[Any] = [list(map(getter, items))]
+    else:
+        rows = list(zip(*map(getter, items), strict=True))
+    return {
+        name: _column(values, typecodes[name], use_numpy)
+        for name, values in zip(field_names, rows or [()] * len(field_names))
+    }
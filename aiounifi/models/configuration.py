@@ -1,13 +1,105 @@
 """Python library to enable integration between Home Assistant and UniFi."""
 
+from collections.abc import Callable
 from dataclasses import KW_ONLY, dataclass
+import json
+import random
 from ssl import SSLContext
-from typing import Literal
+from typing import Any, Literal
+
+import aiohttp
+
+from .. import errors
+
+
+@dataclass(frozen=True)
+class JsonCodec:
+    """JSON decoder and encoder used for REST and websocket data.
+
+    `loads` accepts str or bytes. `dumps` must return str as it is handed to
+    aiohttp as the session JSON serializer.
+    """
+
+    name: str
+    loads: Callable[[str | bytes], Any]
+    dumps: Callable[[Any], str]
+
+
+STDLIB_CODEC = JsonCodec("json", json.loads, json.dumps)
+
+ORJSON_CODEC: JsonCodec | None
+try:
+    import orjson
+except ImportError:
+    ORJSON_CODEC = None
+else:
+
+    def _orjson_dumps(obj: Any) -> str:
+        """Serialize to str as orjson produces bytes."""
+        return orjson.dumps(obj).decode()
+
+    ORJSON_CODEC = JsonCodec("orjson", orjson.loads, _orjson_dumps)
+
+DEFAULT_CODEC = ORJSON_CODEC or STDLIB_CODEC
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Retry idempotent requests failing with transient errors.
+
+    Retries wait with exponential backoff and full jitter, at least as long as
+    a Retry-After header asks for. A request isn't retried if Retry-After is
+    longer than "max_delay". Each request adds "budget_ratio" retries to a
+    budget of at most "budget_capacity" retries, which every retry uses one
+    of, so retries stay a fraction of requests while the controller is down.
+    """
+
+    max_retries: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+    budget_ratio: float = 0.1
+    budget_capacity: float = 10.0
+    idempotent_methods: frozenset[str] = frozenset({"get", "put", "delete"})
+    retry_on: tuple[type[BaseException], ...] = (
+        errors.BadGateway,
+        errors.ServiceUnavailable,
+        errors.TooManyRequests,
+        aiohttp.ClientConnectorError,
+    )
+
+    def delay(self, retry: int, retry_after: float | None) -> float | None:
+        """Return seconds to wait before a retry, counted from 0, None to give up."""
+        if retry >= self.max_retries:
+            return None
+        if retry_after is not None and retry_after > self.max_delay:
+            return None
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2**retry))
+        return delay if retry_after is None else max(delay, retry_after)
+
+
+@dataclass(frozen=True)
+class ConnectionPool:
+    """Connector settings of the session created by the client.
+
+    Connections are kept alive for "keepalive_timeout" seconds between polls
+    so requests reuse an established TLS connection. A "limit_per_host" of 0
+    means no limit.
+    """
+
+    limit: int = 100
+    limit_per_host: int = 0
+    keepalive_timeout: float = 15.0
+    dns_cache_ttl: int | None = 10
 
 
 @dataclass
 class Configuration:
-    """Console configuration."""
+    """Console configuration.
+
+    Clients of several sites share connections through "connector". A
+    "session" of the caller is used instead of creating one, the login of the
+    client is kept in its cookies so it must not be shared by several clients.
+    """
 
     host: str
     _: KW_ONLY
@@ -16,6 +108,12 @@ class Configuration:
     port: int = 8443
     site: str = "default"
     ssl_context: SSLContext | Literal[False] = False
+    codec: JsonCodec = DEFAULT_CODEC
+    max_concurrent_requests: int | None = None
+    retry_policy: RetryPolicy | None = None
+    connection_pool: ConnectionPool = ConnectionPool()
+    connector: aiohttp.BaseConnector | None = None
+    session: aiohttp.ClientSession | None = None
 
     @property
     def url(self) -> str:
@@ -190,6 +190,10 @@ class DevicePortTablePortDelta(ApiItem):
 class Port(ApiItem):
     """Device port table type definition."""
 
+    intern_fields = frozenset(
+        {"media", "op_mode", "poe_class", "poe_mode", "portconf_id", "stp_state"}
+    )
+
     aggregated_by: bool | None = None
     attr_no_edit: bool | None = None
     autoneg: bool | None = None
@@ -205,9 +209,13 @@ class Port(ApiItem):
     ip: str | None = None
     is_uplink: bool | None = None
     jumbo: bool | None = None
-    lldp_table: list[DevicePortTableLldpTable] = field(default_factory=list)
+    lldp_table: list[DevicePortTableLldpTable] = json_field(
+        lazy=True, default_factory=list
+    )
     mac: str | None = None
-    mac_table: list[DevicePortTableMacTable] = field(default_factory=list)
+    mac_table: list[DevicePortTableMacTable] = json_field(
+        lazy=True, default_factory=list
+    )
     masked: bool | None = None
     media: str | None = None
     port_name: str | None = json_field("name", default=None)
@@ -452,11 +460,15 @@ class DeviceStorage(ApiItem):
 class Device(ApiItem):
     """Device type definition."""
 
+    intern_fields = frozenset({"model", "site_id", "type", "version"})
+
     _id: str = ""
     _uptime: int = 0
     adoptable_when_upgraded: bool = False
     adopted: bool = False
-    antenna_table: list[DeviceAntennaTable] = field(default_factory=list)
+    antenna_table: list[DeviceAntennaTable] = json_field(
+        lazy=True, default_factory=list
+    )
     architecture: str = ""
     adoption_completed: int = 0
     bytes: int = 0
@@ -479,7 +491,9 @@ class Device(ApiItem):
     element_peer_mac: str = ""
     element_uplink_ap_mac: str = ""
     ethernet_overrides: list[DeviceEthernetOverrides] = field(default_factory=list)
-    ethernet_table: list[DeviceEthernetTable] = field(default_factory=list)
+    ethernet_table: list[DeviceEthernetTable] = json_field(
+        lazy=True, default_factory=list
+    )
     fan_level: int | None = None
     flowctrl_enabled: bool = False
     fw_caps: int = 0
@@ -514,7 +528,7 @@ class Device(ApiItem):
     led_override_color: str = ""
     led_override_color_brightness: int = 0
     license_state: str = ""
-    lldp_table: list[DeviceLldpTable] = field(default_factory=list)
+    lldp_table: list[DeviceLldpTable] = json_field(lazy=True, default_factory=list)
     locating: bool = False
     mac: str = ""
     manufacturer_id: int = 0
@@ -524,7 +538,9 @@ class Device(ApiItem):
     model_in_lts: bool = False
     model_incompatible: bool = False
     name: str = ""
-    network_table: list[DeviceNetworkTable] = field(default_factory=list)
+    network_table: list[DeviceNetworkTable] = json_field(
+        lazy=True, default_factory=list
+    )
     next_heartbeat_at: int = 0
     next_interval: int = 30
     num_desktop: int = 0
@@ -542,8 +558,10 @@ class Device(ApiItem):
     prev_non_busy_state: int = 0
     provisioned_at: int = 0
     port_overrides: list[DevicePortOverrides] = field(default_factory=list)
-    radio_table: list[DeviceRadioTable] = field(default_factory=list)
-    radio_table_stats: list[DeviceRadioTableStats] = field(default_factory=list)
+    radio_table: list[DeviceRadioTable] = json_field(lazy=True, default_factory=list)
+    radio_table_stats: list[DeviceRadioTableStats] = json_field(
+        lazy=True, default_factory=list
+    )
     required_version: str = ""
     rollupgrade: bool = False
     rx_bytes: int = 0
@@ -609,7 +627,7 @@ class Device(ApiItem):
     board_revision: int = json_field("board_rev", default=None)  # type: ignore
     general_temperature: int | None = None
     ip: str = ""
-    port_table: list[Port] = field(default_factory=list)
+    port_table: list[Port] = json_field(lazy=True, default_factory=list)
 
     @property
     def id(self) -> str:
@@ -0,0 +1,108 @@
+"""Limit concurrent requests and retries to a controller."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+import enum
+
+
+class RequestPriority(enum.IntEnum):
+    """Order in which waiting requests are sent, lowest first."""
+
+    COMMAND = 0
+    LIST = 1
+
+
+class RequestScheduler:
+    """Bound the number of requests in flight to a controller.
+
+    Waiting requests are sent by priority and round robin across sites within
+    a priority, in order per site. A scheduler can be shared between clients
+    of different sites on the same controller.
+    """
+
+    def __init__(self, max_in_flight: int) -> None:
+        """Initialize scheduler."""
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+        self.max_in_flight = max_in_flight
+        self.in_flight = 0
+        self._waiting: dict[RequestPriority, dict[str, deque[asyncio.Future[None]]]] = {
+            priority: {} for priority in RequestPriority
+        }
+
+    @asynccontextmanager
+    async def slot(self, priority: RequestPriority, site: str) -> AsyncIterator[None]:
+        """Wait for a free slot and hold it for the duration of the context."""
+        await self.acquire(priority, site)
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(self, priority: RequestPriority, site: str) -> None:
+        """Wait for a free slot."""
+        # Requests only wait while all slots are taken
+        if self.in_flight < self.max_in_flight:
+            self.in_flight += 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        self._waiting[priority].setdefault(site, deque()).append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            # Pass on a slot granted right before being cancelled
+            if future.done() and not future.cancelled():
+                self.release()
+            raise
+
+    def release(self) -> None:
+        """Free a slot and hand it to the next waiting request."""
+        self.in_flight -= 1
+        while (
+            self.in_flight < self.max_in_flight
+            and (future := self._next_waiting()) is not None
+        ):
+            if future.cancelled():
+                continue
+            self.in_flight += 1
+            future.set_result(None)
+
+    def _next_waiting(self) -> asyncio.Future[None] | None:
+        """Pop the next waiting request, rotating the site to the back."""
+        for sites in self._waiting.values():
+            for site, queue in sites.items():
+                future = queue.popleft()
+                del sites[site]
+                if queue:
+                    sites[site] = queue
+                return future
+        return None
+
+
+class RetryBudget:
+    """Limit retries to a fraction of requests.
+
+    Every request adds "ratio" retries to the budget, up to "capacity", and
+    every retry uses one.
+    """
+
+    def __init__(self, ratio: float, capacity: float) -> None:
+        """Initialize a full budget."""
+        self.ratio = ratio
+        self.capacity = capacity
+        self.tokens = capacity
+
+    def deposit(self) -> None:
+        """Add to the budget for a request."""
+        self.tokens = min(self.capacity, self.tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        """Use one retry from the budget, return False if none is left."""
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
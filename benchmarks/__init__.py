@@ -0,0 +1,4 @@
+"""Micro-benchmarks for aiounifi hot paths.
+
+Run a benchmark from the repository root, e.g. `python -m benchmarks.from_json`.
+"""
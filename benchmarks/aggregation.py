@@ -0,0 +1,85 @@
+"""Measure per access point client aggregates.
+
+Groups 20k clients over 100 access points with a hand-written loop per query,
+and with `access_point_clients` rebuilt with and without NumPy or updated
+incrementally for 1000 changed clients.
+
+python -m benchmarks.aggregation
+"""
+
+from collections import defaultdict
+import timeit
+from types import SimpleNamespace
+from typing import Any
+
+from aiounifi.interfaces.aggregation import access_point_clients
+from aiounifi.interfaces.clients import Clients
+from aiounifi.interfaces.messages import MessageHandler
+
+from .payloads import client_payload
+
+CLIENTS = 20_000
+CHANGES = 1_000
+
+
+def loop(clients: Clients) -> dict[str, Any]:
+    """Aggregate client count, mean RSSI and throughput per access point."""
+    groups: dict[str, list[Any]] = defaultdict(lambda: [0, 0, 0, 0.0])
+    for client in clients.values():
+        if not client.access_point_mac:
+            continue
+        group = groups[client.access_point_mac]
+        group[0] += 1
+        if client.rssi is not None:
+            group[1] += client.rssi
+            group[2] += 1
+        group[3] += client.rx_bytes_r + client.tx_bytes_r
+    return {
+        mac: (count, rssi / rssi_count if rssi_count else None, throughput)
+        for mac, (count, rssi, rssi_count, throughput) in groups.items()
+    }
+
+
+def measure(name: str, function: Any, number: int = 10) -> None:
+    """Print the time per call of function."""
+    elapsed = min(timeit.repeat(function, number=number, repeat=3)) / number
+    print(f"{name}: {elapsed * 1000:.3f} ms")  # noqa: T201
+
+
+if __name__ == "__main__":
+    clients = Clients(SimpleNamespace(messages=MessageHandler(None)))  # type: ignore[arg-type]
+    for index in range(CLIENTS):
+        clients.process_item(client_payload(index))
+    aggregate = access_point_clients(clients)
+
+    expected = loop(clients)
+    for use_numpy in (False, True):
+        aggregate.rebuild(use_numpy)
+        assert aggregate.groups.keys() == expected.keys()
+        assert all(
+            stats.count == expected[mac][0] for mac, stats in aggregate.groups.items()
+        )
+
+    # Alternate between two sets of payloads so every process_item is a change.
+    changes = [
+        [client_payload(index, access_points=points) for index in range(CHANGES)]
+        for points in (99, 100)
+    ]
+
+    def change() -> None:
+        """Process the next set of changed clients."""
+        changes.reverse()
+        for payload in changes[0]:
+            clients.process_item(payload)
+
+    measure("loop query", lambda: loop(clients))
+    measure("python rebuild", lambda: aggregate.rebuild(use_numpy=False))
+    measure("numpy rebuild", lambda: aggregate.rebuild(use_numpy=True))
+    measure(
+        "query",
+        lambda: {mac: stats.mean("rssi") for mac, stats in aggregate.groups.items()},
+        number=1000,
+    )
+    measure(f"{CHANGES} changed clients, with aggregation", change)
+    aggregate.close()
+    measure(f"{CHANGES} changed clients, without aggregation", change)
@@ -0,0 +1,60 @@
+"""Measure websocket frames/sec through `MessageHandler.new_data` for each JSON codec.
+
+python -m benchmarks.codec
+"""
+
+import json
+import time
+
+from aiounifi.client import UnifiClient
+from aiounifi.models.configuration import ORJSON_CODEC, STDLIB_CODEC, Configuration
+from aiounifi.models.message import MessageKey
+
+from .payloads import client_payload, device_payload
+
+
+def frames() -> list[str]:
+    """Return a mix of client and device sync frames."""
+    client_frames = [
+        json.dumps(
+            {
+                "meta": {"rc": "ok", "message": MessageKey.CLIENT.value},
+                "data": [client_payload(index)],
+            }
+        )
+        for index in range(2000)
+    ]
+    device_frames = [
+        json.dumps(
+            {
+                "meta": {"rc": "ok", "message": MessageKey.DEVICE.value},
+                "data": [device_payload(index)],
+            }
+        )
+        for index in range(20)
+    ]
+    return client_frames + device_frames
+
+
+def run(raw_frames: list[str]) -> None:
+    """Feed all frames through a client configured with each available codec."""
+    for codec in (STDLIB_CODEC, ORJSON_CODEC):
+        if codec is None:
+            continue
+        client = UnifiClient(
+            Configuration("host", username="user", password="pass", codec=codec)
+        )
+        best = float("inf")
+        for _ in range(3):
+            start = time.perf_counter()
+            for frame in raw_frames:
+                client.messages.new_data(frame)  # type: ignore[arg-type]
+            best = min(best, time.perf_counter() - start)
+        print(  # noqa: T201
+            f"{codec.name}: {len(raw_frames) / best:,.0f} frames/s "
+            f"({len(raw_frames)} frames in {best * 1000:.1f} ms)"
+        )
+
+
+if __name__ == "__main__":
+    run(frames())
@@ -0,0 +1,97 @@
+"""Count connections opened by clients polling a controller.
+
+Polls a local HTTP server 20 times every 50 ms from 4 sites. Each site uses
+its own connector with a keep-alive shorter than the poll interval, which is
+how polling every 30 s against the 15 s aiohttp default behaves. Then the
+sites share one connector with a keep-alive longer than the interval. Every
+connection opened is a TLS handshake against a real controller.
+
+python -m benchmarks.connections
+"""
+
+import asyncio
+import time
+
+import aiohttp
+from aiohttp import web
+
+from aiounifi.models.configuration import ConnectionPool
+
+SITES = 4
+POLLS = 20
+INTERVAL = 0.05
+
+
+async def handler(request: web.Request) -> web.Response:
+    """Answer like an empty listing."""
+    return web.json_response({"data": []})
+
+
+async def poll(session: aiohttp.ClientSession, url: str) -> None:
+    """Poll the server."""
+    for _ in range(POLLS):
+        async with session.get(url) as response:
+            await response.read()
+        await asyncio.sleep(INTERVAL)
+
+
+def connector(pool: ConnectionPool) -> aiohttp.TCPConnector:
+    """Create a connector like UnifiClient.connect does."""
+    return aiohttp.TCPConnector(
+        limit=pool.limit,
+        limit_per_host=pool.limit_per_host,
+        keepalive_timeout=pool.keepalive_timeout,
+        ttl_dns_cache=pool.dns_cache_ttl,
+    )
+
+
+async def run(shared: bool) -> None:
+    """Poll from every site and print connections opened and time spent."""
+    app = web.Application()
+    app.router.add_get("/", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    url = f"http://127.0.0.1:{runner.addresses[0][1]}/"
+
+    connections = 0
+
+    async def on_connection(*args: object) -> None:
+        nonlocal connections
+        connections += 1
+
+    trace = aiohttp.TraceConfig()
+    trace.on_connection_create_end.append(on_connection)
+
+    if shared:
+        pool = ConnectionPool(keepalive_timeout=INTERVAL * 4)
+        connectors = [connector(pool)] * SITES
+    else:
+        pool = ConnectionPool(keepalive_timeout=INTERVAL / 2)
+        connectors = [connector(pool) for _ in range(SITES)]
+    sessions = [
+        aiohttp.ClientSession(
+            connector=site_connector, connector_owner=False, trace_configs=[trace]
+        )
+        for site_connector in connectors
+    ]
+    start = time.perf_counter()
+    await asyncio.gather(*(poll(session, url) for session in sessions))
+    elapsed = time.perf_counter() - start
+
+    for session in sessions:
+        await session.close()
+    for site_connector in set(connectors):
+        await site_connector.close()
+    await runner.cleanup()
+    print(  # noqa: T201
+        f"{'shared connector' if shared else 'connector per site'}: "
+        f"{connections} connections for {SITES * POLLS} requests, "
+        f"{elapsed * 1000:.0f} ms"
+    )
+
+
+if __name__ == "__main__":
+    for shared in (False, True):
+        asyncio.run(run(shared))
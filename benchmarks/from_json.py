@@ -0,0 +1,38 @@
+"""Compare the generic and generated `ApiItem.from_json` decoders.
+
+python -m benchmarks.from_json
+"""
+
+import timeit
+
+from aiounifi.models.api import ApiItem
+from aiounifi.models.client import Client
+from aiounifi.models.device import Device
+
+from .payloads import clients, devices
+
+
+def run(item_cls: type[Client] | type[Device], raw: list[dict], repeat: int) -> None:
+    """Decode a listing with and without decoder generation."""
+    results = {}
+    for generated in (False, True):
+        ApiItem.generate_decoder = generated
+        results[generated] = min(
+            timeit.repeat(
+                lambda: [item_cls.from_json(item) for item in raw],
+                number=1,
+                repeat=repeat,
+            )
+        )
+    ApiItem.generate_decoder = True
+    print(  # noqa: T201
+        f"{item_cls.__name__} x {len(raw)}: "
+        f"generic {results[False] * 1000:.1f} ms, "
+        f"generated {results[True] * 1000:.1f} ms "
+        f"({results[False] / results[True]:.2f}x)"
+    )
+
+
+if __name__ == "__main__":
+    run(Client, clients(10_000), repeat=5)
+    run(Device, devices(100), repeat=5)
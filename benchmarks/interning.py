@@ -0,0 +1,53 @@
+"""Measure memory saved by interning repeated `Client` string fields.
+
+Decodes 50k clients from JSON, like a `/stat/sta` response, into `Clients` and
+reports the memory retained with and without `Client.intern_fields`.
+
+python -m benchmarks.interning
+"""
+
+import gc
+import json
+import tracemalloc
+from types import SimpleNamespace
+
+from aiounifi.interfaces.clients import Clients
+from aiounifi.interfaces.messages import MessageHandler
+from aiounifi.models.client import Client
+
+from .payloads import client_payload
+
+CLIENTS = 50_000
+
+
+class PlainClient(Client):
+    """Client without interned fields."""
+
+    intern_fields = frozenset()
+
+
+def measure(item_cls: type[Client], frames: list[str]) -> int:
+    """Return the bytes retained after decoding and processing all frames."""
+    client = SimpleNamespace(messages=MessageHandler(None))  # type: ignore[arg-type]
+    handler = Clients(client)  # type: ignore[arg-type]
+    handler.item_cls = item_cls
+    item_cls.from_json({})
+    gc.collect()
+    tracemalloc.start()
+    for frame in frames:
+        handler.process_item(json.loads(frame))
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return retained
+
+
+if __name__ == "__main__":
+    frames = [json.dumps(client_payload(index)) for index in range(CLIENTS)]
+    for item_cls in (PlainClient, Client):
+        retained = measure(item_cls, frames)
+        print(  # noqa: T201
+            f"{item_cls.__name__} x {CLIENTS}, "
+            f"{len(item_cls.intern_fields)} interned fields: "
+            f"{retained / 2**20:.1f} MiB"
+        )
@@ -0,0 +1,65 @@
+"""Measure lazy decoding of nested `Device` tables in a client.
+
+Processes `device:sync` updates of 300 48-port switches through
+`UnifiClient.devices.process_raw`, with the `Ports` and `Outlets` handlers and
+a change subscriber attached like in an integration. Updates either only
+change device counters or also change port counters. Devices decoding their
+tables lazily are compared with devices decoding every table up front.
+
+python -m benchmarks.lazy
+"""
+
+import timeit
+from typing import Any
+from unittest.mock import patch
+
+from aiounifi.client import UnifiClient
+from aiounifi.models.configuration import Configuration
+from aiounifi.models.device import Device
+
+from .payloads import devices
+
+SWITCHES = 300
+
+
+class EagerDevice(Device):
+    """Device decoding every nested table when created from JSON."""
+
+
+def updates(port_counters: bool) -> list[list[dict[str, Any]]]:
+    """Return two alternating device listings differing in counters."""
+    listings = [devices(SWITCHES), devices(SWITCHES)]
+    for device in listings[1]:
+        device["uptime"] += 1
+        if port_counters:
+            for port in device["port_table"]:
+                port["rx_bytes"] += 1
+    return listings
+
+
+def measure(item_cls: type[Device], port_counters: bool) -> float:
+    """Return the seconds to process one update of all switches."""
+    client = UnifiClient(Configuration("host", username="user", password="pass"))
+    client.devices.item_cls = item_cls
+    client.devices.subscribe_changes(lambda obj_id, changed_fields: None)
+    listings = updates(port_counters)
+    client.devices.process_raw(listings[0])
+
+    def update() -> None:
+        listings.reverse()
+        client.devices.process_raw(listings[0])
+
+    return min(timeit.repeat(update, number=1, repeat=10))
+
+
+if __name__ == "__main__":
+    with patch("aiounifi.models.api._is_lazy", return_value=False):
+        EagerDevice.from_json({})
+    for port_counters in (False, True):
+        for item_cls in (EagerDevice, Device):
+            elapsed = measure(item_cls, port_counters)
+            print(  # noqa: T201
+                f"{'eager' if item_cls is EagerDevice else 'lazy'}, "
+                f"{'port' if port_counters else 'device'} counters changed: "
+                f"{SWITCHES} switches in {elapsed * 1000:.1f} ms"
+            )
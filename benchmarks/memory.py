@@ -0,0 +1,56 @@
+"""Measure memory retained by `Clients` and `Devices` per item representation.
+
+Processes 50k clients and 500 48-port switches into their handlers and reports
+the memory traced by tracemalloc for the default items and each compact raw
+mode.
+
+python -m benchmarks.memory
+"""
+
+import gc
+import tracemalloc
+from types import SimpleNamespace
+
+from aiounifi.interfaces.api_handlers import APIHandler
+from aiounifi.interfaces.clients import Clients
+from aiounifi.interfaces.devices import Devices
+from aiounifi.interfaces.messages import MessageHandler
+from aiounifi.models.api import RawMode
+
+from .payloads import client_payload, device_payload
+
+CLIENTS = 50_000
+DEVICES = 500
+
+
+def measure(handler_cls: type[APIHandler], count: int, raw_mode: RawMode | None) -> int:
+    """Return the bytes retained after processing count generated items."""
+    payload = client_payload if handler_cls is Clients else device_payload
+    client = SimpleNamespace(messages=MessageHandler(None))  # type: ignore[arg-type]
+    gc.collect()
+    tracemalloc.start()
+    handler = handler_cls(client)  # type: ignore[arg-type]
+    if raw_mode is not None:
+        handler.use_compact_items(raw_mode)
+    for index in range(count):
+        handler.process_item(payload(index))
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return retained
+
+
+if __name__ == "__main__":
+    for handler_cls, count in ((Clients, CLIENTS), (Devices, DEVICES)):
+        # Generate classes and decoders up front so they aren't measured.
+        for raw_mode in RawMode:
+            handler_cls.item_cls.compact(raw_mode).from_json({})
+        handler_cls.item_cls.from_json({})
+
+        for raw_mode in (None, *RawMode):
+            retained = measure(handler_cls, count, raw_mode)
+            print(  # noqa: T201
+                f"{handler_cls.__name__} {count} items, "
+                f"{'default' if raw_mode is None else f'compact {raw_mode.value}'}: "
+                f"{retained / 2**20:.1f} MiB"
+            )
@@ -0,0 +1,90 @@
+"""Measure `_merge_overrides` for full port override sets.
+
+Applies a template overriding all ports of a 52-port switch to 200 switches
+with existing overrides on every port, and compares with the previous
+implementation.
+
+python -m benchmarks.overrides
+"""
+
+from collections.abc import Sequence
+from copy import deepcopy
+from dataclasses import fields
+import timeit
+
+from aiounifi.interfaces.devices import _merge_overrides
+from aiounifi.models.device import Device, DevicePortOverrides
+
+from .payloads import devices
+
+SWITCHES = 200
+PORTS = 52
+
+
+def legacy_replace(
+    override: DevicePortOverrides, other: DevicePortOverrides
+) -> DevicePortOverrides:
+    """Replace values like before, through __init__ and deep copying raw."""
+    new_item_data = {}
+    for api_field in fields(override):
+        if api_field.name == "raw":
+            continue
+        new_item_data[api_field.name] = getattr(override, api_field.name)
+        new_value = getattr(other, api_field.name, None)
+        if new_value is not None:
+            new_item_data[api_field.name] = new_value
+    new_item = override.__class__(**new_item_data)
+    new_item.raw = deepcopy(override.raw)
+    return new_item
+
+
+def legacy_merge_overrides(
+    existing_overrides: Sequence[DevicePortOverrides],
+    new_overrides: Sequence[DevicePortOverrides],
+    index_attr: str,
+) -> list[DevicePortOverrides]:
+    """Merge by slicing off the head of the sorted new overrides."""
+    merged_overrides: list[DevicePortOverrides] = []
+    sorted_overrides = sorted(
+        new_overrides, key=lambda override: getattr(override, index_attr)
+    )
+    for override in existing_overrides:
+        existing_index = getattr(override, index_attr)
+        if sorted_overrides:
+            new_index = getattr(sorted_overrides[0], index_attr)
+            if existing_index == new_index:
+                merged_overrides.append(legacy_replace(override, sorted_overrides[0]))
+                sorted_overrides = sorted_overrides[1:]
+            elif new_index < existing_index:
+                merged_overrides.append(sorted_overrides[0])
+                merged_overrides.append(override)
+                sorted_overrides = sorted_overrides[1:]
+            else:
+                merged_overrides.append(override)
+        else:
+            merged_overrides.append(override)
+    merged_overrides.extend(sorted_overrides)
+    return merged_overrides
+
+
+if __name__ == "__main__":
+    switches = [Device.from_json(device) for device in devices(SWITCHES, PORTS)]
+    template = [
+        DevicePortOverrides(port_idx=port, poe_mode="off", name=f"Desk {port}")
+        for port in range(PORTS, 0, -1)
+    ]
+    for merge in (legacy_merge_overrides, _merge_overrides):
+        elapsed = min(
+            timeit.repeat(
+                lambda: [
+                    merge(switch.port_overrides, template, "port_idx")  # noqa: B023
+                    for switch in switches
+                ],
+                number=1,
+                repeat=5,
+            )
+        )
+        print(  # noqa: T201
+            f"{merge.__name__}: {SWITCHES} switches x {PORTS} overrides "
+            f"in {elapsed * 1000:.1f} ms"
+        )
@@ -0,0 +1,189 @@
+"""Synthetic controller payloads shaped like real `/stat/sta` and `/stat/device` data."""
+
+from typing import Any
+
+
+def mac(index: int, prefix: int = 0) -> str:
+    """Return a MAC address string for an index."""
+    value = (prefix << 32) | index
+    return ":".join(f"{(value >> shift) & 0xFF:02x}" for shift in range(40, -8, -8))
+
+
+def client_payload(
+    index: int, access_points: int = 100, switches: int = 50
+) -> dict[str, Any]:
+    """Return a raw client as reported by the controller."""
+    wired = index % 4 == 0
+    return {
+        "_id": f"{index:024x}",
+        "_is_guest_by_uap": False,
+        "_is_guest_by_usw": False,
+        "_last_seen_by_uap": 1700000000 + index,
+        "_uptime_by_uap": 3600 + index,
+        "anomalies": 0,
+        "ap_mac": "" if wired else mac(index % access_points, 1),
+        "assoc_time": 1699990000,
+        "authorized": True,
+        "blocked": False,
+        "bssid": mac(index % access_points, 2),
+        "bytes-r": index % 1000,
+        "ccq": 333,
+        "channel": 36,
+        "dev_cat": 1,
+        "dev_family": 4,
+        "dev_id": 239,
+        "dev_vendor": 47,
+        "essid": f"ssid-{index % 4}",
+        "first_seen": 1690000000,
+        "hostname": f"client-{index}",
+        "idletime": index % 60,
+        "ip": f"10.{(index >> 16) & 0xFF}.{(index >> 8) & 0xFF}.{index & 0xFF}",
+        "is_guest": False,
+        "is_wired": wired,
+        "last_seen": 1700000000 + index,
+        "latest_assoc_time": 1699990000,
+        "mac": mac(index),
+        "name": f"Client {index}",
+        "network": "LAN",
+        "network_id": "5f0000000000000000000001",
+        "noise": -105,
+        "oui": "Apple",
+        "powersave_enabled": False,
+        "qos_policy_applied": True,
+        "radio": "na",
+        "radio_name": "wifi1",
+        "radio_proto": "ac",
+        "rssi": 40 + index % 30,
+        "rx_bytes": 1000000 + index,
+        "rx_bytes-r": float(index % 5000),
+        "rx_packets": 10000 + index,
+        "rx_rate": 866000,
+        "satisfaction": 90 + index % 10,
+        "signal": -60 + index % 20,
+        "site_id": "5f0000000000000000000000",
+        "sw_depth": 1,
+        "sw_mac": mac(index % switches, 3),
+        "sw_port": index % 48 + 1,
+        "tx_bytes": 2000000 + index,
+        "tx_bytes-r": float(index % 3000),
+        "tx_packets": 20000 + index,
+        "tx_power": 40,
+        "tx_rate": 866000,
+        "tx_retries": 12,
+        "uptime": 3600 + index,
+        "user_id": f"{index:024x}",
+        "usergroup_id": "5f0000000000000000000002",
+        "vlan": 0,
+        "wifi_tx_attempts": 5000,
+        "wired-rx_bytes": 0,
+        "wired-tx_bytes": 0,
+    }
+
+
+def port_payload(index: int) -> dict[str, Any]:
+    """Return a raw switch port table entry."""
+    return {
+        "port_idx": index,
+        "media": "GE",
+        "port_poe": True,
+        "poe_caps": 7,
+        "speed_caps": 1048623,
+        "op_mode": "switch",
+        "poe_mode": "auto",
+        "portconf_id": "5f0000000000000000000003",
+        "autoneg": True,
+        "enable": True,
+        "flowctrl_rx": False,
+        "flowctrl_tx": False,
+        "full_duplex": True,
+        "is_uplink": index == 1,
+        "jumbo": False,
+        "mac_table": [
+            {
+                "age": 10,
+                "mac": mac(index * 4 + entry),
+                "static": False,
+                "uptime": 10,
+                "vlan": 1,
+            }
+            for entry in range(4)
+        ],
+        "name": f"Port {index}",
+        "poe_class": "Class 4",
+        "poe_current": "120.50",
+        "poe_enable": True,
+        "poe_good": True,
+        "poe_power": "5.80",
+        "poe_voltage": "53.20",
+        "rx_broadcast": 100,
+        "rx_bytes": 1000000 * index,
+        "rx_bytes-r": 100 * index,
+        "rx_dropped": 0,
+        "rx_errors": 0,
+        "rx_multicast": 10,
+        "rx_packets": 10000 * index,
+        "satisfaction": 100,
+        "speed": 1000,
+        "stp_pathcost": 20000,
+        "stp_state": "forwarding",
+        "tx_broadcast": 100,
+        "tx_bytes": 2000000 * index,
+        "tx_bytes-r": 200 * index,
+        "tx_dropped": 0,
+        "tx_errors": 0,
+        "tx_multicast": 10,
+        "tx_packets": 20000 * index,
+        "up": True,
+    }
+
+
+def device_payload(index: int, ports: int = 48) -> dict[str, Any]:
+    """Return a raw switch with a populated port table."""
+    return {
+        "_id": f"{index:024x}",
+        "_uptime": 86400,
+        "adopted": True,
+        "board_rev": 17,
+        "cfgversion": "0123456789abcdef",
+        "device_id": f"{index:024x}",
+        "ip": f"10.255.{(index >> 8) & 0xFF}.{index & 0xFF}",
+        "last_seen": 1700000000,
+        "lldp_table": [
+            {"chassis_id": mac(index, 4), "local_port_idx": 1, "port_id": "Port 1"}
+        ],
+        "mac": mac(index, 3),
+        "model": "US48P500",
+        "name": f"Switch {index}",
+        "num_sta": 40,
+        "port_overrides": [
+            {
+                "port_idx": port,
+                "poe_mode": "auto",
+                "portconf_id": "5f0000000000000000000003",
+            }
+            for port in range(1, ports + 1)
+        ],
+        "port_table": [port_payload(port) for port in range(1, ports + 1)],
+        "rx_bytes": 123456789,
+        "satisfaction": 100,
+        "serial": f"SERIAL{index}",
+        "site_id": "5f0000000000000000000000",
+        "state": 1,
+        "sys_stats": {"loadavg_1": "0.5", "mem_total": 1000, "mem_used": 500},
+        "system-stats": {"cpu": "10", "mem": "50", "uptime": "86400"},
+        "tx_bytes": 987654321,
+        "type": "usw",
+        "uplink": {"full_duplex": True, "ip": "10.0.0.1", "speed": 10000, "up": True},
+        "uptime": 86400,
+        "version": "6.6.61.15220",
+    }
+
+
+def clients(count: int) -> list[dict[str, Any]]:
+    """Return a `/stat/sta` listing."""
+    return [client_payload(index) for index in range(count)]
+
+
+def devices(count: int, ports: int = 48) -> list[dict[str, Any]]:
+    """Return a `/stat/device` listing."""
+    return [device_payload(index, ports) for index in range(count)]
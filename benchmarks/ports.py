@@ -0,0 +1,79 @@
+"""Measure `Ports.process_device` for `device:sync` of many switches.
+
+Syncs 300 48-port switches where a single port counter changed, then removes
+them, and compares with the previous scan and rewrite implementation.
+
+python -m benchmarks.ports
+"""
+
+import timeit
+from types import SimpleNamespace
+
+from aiounifi.interfaces.api_handlers import ItemEvent
+from aiounifi.interfaces.devices import Devices
+from aiounifi.interfaces.messages import MessageHandler
+from aiounifi.interfaces.ports import Ports
+
+from .payloads import devices
+
+SWITCHES = 300
+PORTS = 48
+
+
+class LegacyPorts(Ports):
+    """Ports handler using the previous implementation."""
+
+    def process_device(self, event: ItemEvent, obj_id: str) -> None:
+        """Rewrite all ports and scan all keys on removal."""
+        if event in (ItemEvent.ADDED, ItemEvent.CHANGED):
+            device = self.client.devices[obj_id]
+            for port in device.port_table:
+                if (port_idx := port.port_idx or port.ifname) is None:
+                    continue
+                self[f"{obj_id}_{port_idx}"] = port
+            return
+        for port_id in [port_id for port_id in self if port_id.startswith(obj_id)]:
+            self.pop(port_id)
+
+
+def run(ports_cls: type[Ports]) -> tuple[float, float, int]:
+    """Return the elapsed time of a sync and a removal of all switches.
+
+    Also return the number of port events signalled by the first sync.
+    """
+    raw = devices(SWITCHES, PORTS)
+    client = SimpleNamespace(messages=MessageHandler(None))  # type: ignore[arg-type]
+    client.devices = Devices(client)  # type: ignore[arg-type]
+    ports = ports_cls(client)  # type: ignore[arg-type]
+    client.devices.process_raw(raw)
+    signals = []
+    ports.subscribe(lambda event, obj_id: signals.append(obj_id))
+
+    changed = devices(SWITCHES, PORTS)
+    for device in changed:
+        device["port_table"][1]["rx_packets"] += 1
+    decoded = [client.devices.item_cls.from_json(device) for device in changed]
+
+    def sync() -> None:
+        for device in decoded:
+            client.devices.data[device.mac] = device
+            ports.process_device(ItemEvent.CHANGED, device.mac)
+
+    def remove() -> None:
+        for device in decoded:
+            ports.process_device(ItemEvent.DELETED, device.mac)
+
+    synced = timeit.timeit(sync, number=1)
+    signalled = len(signals)
+    removed = timeit.timeit(remove, number=1)
+    return synced, removed, signalled
+
+
+if __name__ == "__main__":
+    for ports_cls in (LegacyPorts, Ports):
+        synced, removed, signalled = run(ports_cls)
+        print(  # noqa: T201
+            f"{ports_cls.__name__}: sync {synced * 1000:.1f} ms signalling "
+            f"{signalled} ports, remove {removed * 1000:.1f} ms "
+            f"for {SWITCHES}x{PORTS} ports"
+        )
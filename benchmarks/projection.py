@@ -0,0 +1,93 @@
+"""Measure field projection for `Clients` and `Devices`.
+
+Decodes 50k clients keeping 10 fields and 500 48-port switches keeping 20
+fields, and compares time and retained memory with full compact items. Both
+variants retain no raw data.
+
+python -m benchmarks.projection
+"""
+
+import gc
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+from aiounifi.interfaces.api_handlers import APIHandler
+from aiounifi.interfaces.clients import Clients
+from aiounifi.interfaces.devices import Devices
+from aiounifi.interfaces.messages import MessageHandler
+from aiounifi.models.api import RawMode
+
+from .payloads import clients, devices
+
+CLIENT_FIELDS = (
+    "mac",
+    "ip",
+    "hostname",
+    "name",
+    "is_wired",
+    "last_seen",
+    "access_point_mac",
+    "switch_mac",
+    "switch_port",
+    "rssi",
+)
+DEVICE_FIELDS = (
+    "_id",
+    "mac",
+    "ip",
+    "name",
+    "model",
+    "type",
+    "version",
+    "state",
+    "adopted",
+    "uptime",
+    "last_seen",
+    "satisfaction",
+    "num_sta",
+    "rx_bytes",
+    "tx_bytes",
+    "port_table",
+    "uplink",
+    "sys_stats",
+    "system_stats",
+    "serial",
+)
+
+
+def measure(
+    handler_cls: type[APIHandler], raw: list[dict], projection: tuple[str, ...] | None
+) -> tuple[float, int]:
+    """Return the time to process the raw items and the memory retained by them."""
+    client = SimpleNamespace(messages=MessageHandler(None))  # type: ignore[arg-type]
+    handler = handler_cls(client)  # type: ignore[arg-type]
+    handler.use_compact_items(RawMode.NONE, projection)
+    handler.item_cls.from_json({})
+
+    start = time.perf_counter()
+    handler.process_raw(raw)
+    elapsed = time.perf_counter() - start
+
+    handler.clear()
+    gc.collect()
+    tracemalloc.start()
+    handler.process_raw(raw)
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, retained
+
+
+if __name__ == "__main__":
+    for handler_cls, raw, projection in (
+        (Clients, clients(50_000), CLIENT_FIELDS),
+        (Devices, devices(500), DEVICE_FIELDS),
+    ):
+        for fields in (None, projection):
+            elapsed, retained = measure(handler_cls, raw, fields)
+            print(  # noqa: T201
+                f"{handler_cls.__name__} x {len(raw)}, "
+                f"{'all' if fields is None else len(fields)} fields: "
+                f"{elapsed * 1000:.1f} ms, {retained / 2**20:.1f} MiB"
+            )
@@ -0,0 +1,86 @@
+"""Measure clients recovering from a controller restart.
+
+Runs 50 clients polling a fake controller every 100 ms for 3 s. The
+controller answers 503 for the first second, like while it restarts. Each
+client retries immediately like callers did before, or with `RetryPolicy`
+backoff, jitter and retry budget. Reports failed requests and the peak number
+of requests the controller gets in 10 ms.
+
+python -m benchmarks.retry
+"""
+
+import asyncio
+from collections import Counter
+import time
+
+from aiounifi import errors
+from aiounifi.models.configuration import RetryPolicy
+from aiounifi.scheduler import RetryBudget
+
+CLIENTS = 50
+INTERVAL = 0.1
+DURATION = 3.0
+RESTART = 1.0
+
+
+class Controller:
+    """Fake controller that is unavailable for a while after starting."""
+
+    def __init__(self) -> None:
+        """Initialize counters."""
+        self.start = time.perf_counter()
+        self.failed = 0
+        self.buckets: Counter[int] = Counter()
+
+    async def request(self) -> None:
+        """Serve a request or fail it while restarting."""
+        now = time.perf_counter() - self.start
+        self.buckets[int(now * 100)] += 1
+        await asyncio.sleep(0.001)
+        if now < RESTART:
+            self.failed += 1
+            raise errors.ServiceUnavailable
+
+
+async def poll(controller: Controller, policy: RetryPolicy | None) -> None:
+    """Poll the controller, retrying failed requests."""
+    budget = (
+        None
+        if policy is None
+        else RetryBudget(policy.budget_ratio, policy.budget_capacity)
+    )
+    while time.perf_counter() - controller.start < DURATION:
+        retry = 0
+        while True:
+            try:
+                await controller.request()
+                break
+            except errors.ServiceUnavailable:
+                if policy is None or budget is None:
+                    # Callers re-requested straight away
+                    await asyncio.sleep(0)
+                    continue
+                delay = policy.delay(retry, None)
+                if delay is None or not budget.withdraw():
+                    break
+                await asyncio.sleep(delay)
+                retry += 1
+        if budget is not None:
+            budget.deposit()
+        await asyncio.sleep(INTERVAL)
+
+
+async def restart(policy: RetryPolicy | None) -> None:
+    """Run the clients through a restart and print the outcome."""
+    controller = Controller()
+    await asyncio.gather(*(poll(controller, policy) for _ in range(CLIENTS)))
+    print(  # noqa: T201
+        f"{'immediate retries' if policy is None else 'retry policy'}: "
+        f"{controller.failed} failed requests, "
+        f"peak {max(controller.buckets.values())} requests per 10 ms"
+    )
+
+
+if __name__ == "__main__":
+    for policy in (None, RetryPolicy()):
+        asyncio.run(restart(policy))
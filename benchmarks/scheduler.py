@@ -0,0 +1,71 @@
+"""Measure a request storm through `RequestScheduler`.
+
+Sends 200 list requests from 4 sites and one command to a fake controller
+that fails requests above 8 concurrent with 503, without a scheduler and with
+a scheduler allowing 8 requests in flight. Reports failed requests, total time
+and how long the command waited.
+
+python -m benchmarks.scheduler
+"""
+
+import asyncio
+from contextlib import nullcontext
+import time
+
+from aiounifi.scheduler import RequestPriority, RequestScheduler
+
+LISTS = 200
+SITES = 4
+CAPACITY = 8
+LATENCY = 0.005
+
+
+class Controller:
+    """Fake controller serving a limited number of concurrent requests."""
+
+    def __init__(self) -> None:
+        """Initialize counters."""
+        self.in_flight = 0
+        self.failed = 0
+
+    async def request(self) -> None:
+        """Serve a request, failing it if the controller is overloaded."""
+        self.in_flight += 1
+        try:
+            await asyncio.sleep(LATENCY)
+            if self.in_flight > CAPACITY:
+                self.failed += 1
+        finally:
+            self.in_flight -= 1
+
+
+async def storm(scheduler: RequestScheduler | None) -> None:
+    """Send the requests and print the outcome."""
+    controller = Controller()
+
+    async def request(priority: RequestPriority, site: str) -> float:
+        start = time.perf_counter()
+        async with (
+            nullcontext() if scheduler is None else scheduler.slot(priority, site)
+        ):
+            await controller.request()
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    lists = [
+        asyncio.create_task(request(RequestPriority.LIST, f"site{index % SITES}"))
+        for index in range(LISTS)
+    ]
+    await asyncio.sleep(0)
+    command = await request(RequestPriority.COMMAND, "site0")
+    await asyncio.gather(*lists)
+    print(  # noqa: T201
+        f"{'no scheduler' if scheduler is None else f'max {scheduler.max_in_flight}'}: "
+        f"{controller.failed} failed, {(time.perf_counter() - start) * 1000:.0f} ms "
+        f"total, command done in {command * 1000:.0f} ms"
+    )
+
+
+if __name__ == "__main__":
+    for scheduler in (None, RequestScheduler(CAPACITY)):
+        asyncio.run(storm(scheduler))
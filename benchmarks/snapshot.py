@@ -0,0 +1,90 @@
+"""Measure aggregating client fields through `APIHandler.snapshot`.
+
+Computes sums and means of four fields over 20k clients with a per-object
+Python loop, and separately times building a snapshot of the fields and
+aggregating over its array and NumPy columns.
+
+python -m benchmarks.snapshot
+"""
+
+import math
+import statistics
+import timeit
+from types import SimpleNamespace
+from typing import Any
+
+from aiounifi.interfaces.clients import Clients
+from aiounifi.interfaces.messages import MessageHandler
+
+from .payloads import clients
+
+CLIENTS = 20_000
+FIELDS = ("rx_bytes_r", "tx_bytes_r", "rssi", "satisfaction")
+
+
+def loop(handler: Clients) -> dict[str, Any]:
+    """Aggregate by iterating over the items."""
+    rx = tx = 0.0
+    rssi: list[int] = []
+    satisfaction: list[int] = []
+    for client in handler.values():
+        rx += client.rx_bytes_r
+        tx += client.tx_bytes_r
+        if client.rssi is not None:
+            rssi.append(client.rssi)
+        if client.satisfaction is not None:
+            satisfaction.append(client.satisfaction)
+    return {
+        "rx": rx,
+        "tx": tx,
+        "rssi": statistics.fmean(rssi),
+        "satisfaction": statistics.fmean(satisfaction),
+    }
+
+
+def columns_array(snapshot: dict[str, Any]) -> dict[str, Any]:
+    """Aggregate over array columns."""
+    rssi = [value for value in snapshot["rssi"] if not math.isnan(value)]
+    satisfaction = [
+        value for value in snapshot["satisfaction"] if not math.isnan(value)
+    ]
+    return {
+        "rx": math.fsum(snapshot["rx_bytes_r"]),
+        "tx": math.fsum(snapshot["tx_bytes_r"]),
+        "rssi": statistics.fmean(rssi),
+        "satisfaction": statistics.fmean(satisfaction),
+    }
+
+
+def columns_numpy(snapshot: dict[str, Any]) -> dict[str, Any]:
+    """Aggregate over NumPy columns."""
+    import numpy as np
+
+    return {
+        "rx": snapshot["rx_bytes_r"].sum(),
+        "tx": snapshot["tx_bytes_r"].sum(),
+        "rssi": np.nanmean(snapshot["rssi"]),
+        "satisfaction": np.nanmean(snapshot["satisfaction"]),
+    }
+
+
+def measure(name: str, function: Any) -> None:
+    """Print the time per call of function."""
+    elapsed = min(timeit.repeat(function, number=10, repeat=3)) / 10
+    print(f"{name}: {elapsed * 1000:.2f} ms")  # noqa: T201
+
+
+if __name__ == "__main__":
+    handler = Clients(SimpleNamespace(messages=MessageHandler(None)))  # type: ignore[arg-type]
+    for payload in clients(CLIENTS):
+        handler.process_item(payload)
+
+    expected = loop(handler)
+    measure("loop aggregate", lambda: loop(handler))
+    for use_numpy, aggregate in ((False, columns_array), (True, columns_numpy)):
+        snapshot = handler.snapshot(FIELDS, use_numpy)
+        result = aggregate(snapshot)
+        assert all(math.isclose(result[key], expected[key]) for key in expected)
+        kind = "numpy" if use_numpy else "array"
+        measure(f"{kind} snapshot", lambda: handler.snapshot(FIELDS, use_numpy))  # noqa: B023
+        measure(f"{kind} aggregate", lambda: aggregate(snapshot))  # noqa: B023
@@ -0,0 +1,101 @@
+"""Measure `APIHandler.process_item` subscriber fan-out.
+
+Runs 100k `process_item` calls against a handler with 50 subscribers, and
+compares with the previous list concatenating dispatch.
+
+python -m benchmarks.subscribers
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass
+import timeit
+from typing import Any
+
+from aiounifi.interfaces.api_handlers import (
+    ID_FILTER_ALL,
+    APIHandler,
+    ItemEvent,
+    Subscription,
+)
+from aiounifi.models.api import ApiItem
+
+from .payloads import mac
+
+CALLS = 100_000
+ITEMS = 1_000
+
+
+@dataclass
+class Item(ApiItem):
+    """Small item so that dispatch dominates the measurement."""
+
+    mac: str = ""
+    counter: int = 0
+
+
+class Handler(APIHandler[Item]):
+    """Handler for the small item."""
+
+    obj_id_key = "mac"
+    item_cls = Item
+
+
+class LegacyHandler(Handler):
+    """Handler using the previous dispatch implementation."""
+
+    def __init__(self, client: Any) -> None:
+        """Use a defaultdict of lists like before."""
+        super().__init__(client)
+        self._subscribers = defaultdict(list)  # type: ignore[assignment]
+
+    def signal_subscribers(self, event: ItemEvent, obj_id: str) -> None:
+        """Concatenate id and wildcard subscribers for every signal."""
+        subscribers: list[Subscription] = (
+            self._subscribers[obj_id] + self._subscribers[ID_FILTER_ALL]  # type: ignore[operator]
+        )
+        for subscriber in subscribers:
+            if subscriber.event_filter is None or event in subscriber.event_filter:
+                subscriber.callback(event, obj_id)
+
+    def subscribe(self, callback, event_filter=None, id_filter=None):  # type: ignore[no-untyped-def]
+        """Subscribe using mutable lists."""
+        if isinstance(event_filter, ItemEvent):
+            event_filter = (event_filter,)
+        subscription = Subscription(
+            callback, None if event_filter is None else set(event_filter)
+        )
+        for obj_id in (id_filter,) if isinstance(id_filter, str) else (ID_FILTER_ALL,):
+            self._subscribers[obj_id].append(subscription)  # type: ignore[attr-defined]
+
+
+def callback(event: ItemEvent, obj_id: str) -> None:
+    """Do nothing."""
+
+
+def populate(handler: Handler) -> None:
+    """Add 10 wildcard and 40 per id subscribers."""
+    for index in range(10):
+        handler.subscribe(callback, None if index % 2 else ItemEvent.CHANGED)
+    for index in range(40):
+        handler.subscribe(callback, ItemEvent.CHANGED, mac(index))
+
+
+def run(handler: Handler, raw: list[dict[str, Any]]) -> float:
+    """Process all raw items and return the elapsed time."""
+    return min(
+        timeit.repeat(
+            lambda: [handler.process_item(item) for item in raw], number=1, repeat=3
+        )
+    )
+
+
+if __name__ == "__main__":
+    raw = [{"mac": mac(index % ITEMS), "counter": index} for index in range(CALLS)]
+    for handler_cls in (LegacyHandler, Handler):
+        handler = handler_cls(None)  # type: ignore[arg-type]
+        populate(handler)
+        elapsed = run(handler, raw)
+        print(  # noqa: T201
+            f"{handler_cls.__name__}: {CALLS} process_item calls in "
+            f"{elapsed * 1000:.1f} ms, subscriber map size {len(handler._subscribers)}"
+        )
@@ -0,0 +1,41 @@
+"""Compare the generic and generated `ApiItem.to_json` encoders on `Device`.
+
+python -m benchmarks.to_json
+"""
+
+import timeit
+
+from aiounifi.models.api import ApiItem
+from aiounifi.models.device import Device
+
+from .payloads import device_payload
+
+OUTPUT_FIELDS = {"port_overrides"}
+
+
+def run(device: Device, output_fields: set[str] | None, number: int) -> None:
+    """Encode a device with and without encoder generation."""
+    results = {}
+    for generated in (False, True):
+        ApiItem.generate_encoder = generated
+        results[generated] = min(
+            timeit.repeat(
+                lambda: device.to_json(output_fields),
+                number=number,
+                repeat=5,
+            )
+        )
+    ApiItem.generate_encoder = True
+    print(  # noqa: T201
+        f"Device.to_json({output_fields}) x {number}: "
+        f"generic {results[False] * 1000:.1f} ms, "
+        f"generated {results[True] * 1000:.1f} ms "
+        f"({results[False] / results[True]:.2f}x)"
+    )
+
+
+if __name__ == "__main__":
+    device = Device.from_json(device_payload(0, ports=52))
+    run(device, None, number=200)
+    run(device, OUTPUT_FIELDS, number=200)
+    run(device, {"led_override"}, number=2000)
@@ -0,0 +1,59 @@
+"""Measure a refresh storm of concurrent `APIHandler.update` calls.
+
+Runs 20 concurrent `Clients.update` calls against a fake controller answering
+5k clients after 10 ms, with the calls coalesced and with every call making
+its own request like before.
+
+python -m benchmarks.update
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+from typing import Any
+
+from aiounifi.interfaces.clients import Clients
+from aiounifi.interfaces.messages import MessageHandler
+from aiounifi.models.api import ApiResponse
+
+from .payloads import clients
+
+CALLS = 20
+CLIENTS = 5_000
+LATENCY = 0.01
+
+
+class Controller(SimpleNamespace):
+    """Fake controller counting requests."""
+
+    requests = 0
+
+    async def get(self, endpoint: Any) -> ApiResponse:
+        """Answer the client listing after a delay."""
+        self.requests += 1
+        await asyncio.sleep(LATENCY)
+        return ApiResponse(data=clients(CLIENTS))
+
+
+async def storm(coalesced: bool) -> None:
+    """Run concurrent updates and print requests and time spent."""
+    controller = Controller(messages=MessageHandler(None))  # type: ignore[arg-type]
+    handler = Clients(controller)  # type: ignore[arg-type]
+    assert handler.list_endpoint is not None
+    start, cpu = time.perf_counter(), time.process_time()
+    await asyncio.gather(
+        *(
+            handler.update() if coalesced else handler._refresh(handler.list_endpoint)
+            for _ in range(CALLS)
+        )
+    )
+    print(  # noqa: T201
+        f"{'coalesced' if coalesced else 'separate'}: {controller.requests} requests, "
+        f"{(time.perf_counter() - start) * 1000:.0f} ms wall, "
+        f"{(time.process_time() - cpu) * 1000:.0f} ms CPU"
+    )
+
+
+if __name__ == "__main__":
+    for coalesced in (False, True):
+        asyncio.run(storm(coalesced))
@@ -0,0 +1,146 @@
+"""Test grouped aggregates over handler items.
+
+pytest --cov-report term-missing --cov=aiounifi.interfaces.aggregation tests/test_aggregation.py
+"""
+
+from unittest.mock import Mock
+
+import pytest
+
+from aiounifi.interfaces import aggregation
+from aiounifi.interfaces.aggregation import (
+    GroupStats,
+    access_point_clients,
+    device_models,
+    switch_clients,
+    switch_poe_power,
+)
+from aiounifi.interfaces.api_handlers import ItemEvent
+from aiounifi.interfaces.clients import Clients
+from aiounifi.interfaces.devices import Devices
+from aiounifi.interfaces.ports import Ports
+from aiounifi.models.device import Device
+
+USE_NUMPY = [
+    False,
+    pytest.param(
+        True,
+        marks=pytest.mark.skipif(aggregation.np is None, reason="numpy not installed"),
+    ),
+]
+
+
+@pytest.mark.parametrize("use_numpy", USE_NUMPY)
+def test_access_point_clients(use_numpy):
+    """Verify clients are aggregated per access point and kept up to date."""
+    clients = Clients(Mock())
+    clients.process_item({"mac": "1", "ap_mac": "ap1", "rssi": 40, "rx_bytes-r": 1.0})
+    clients.process_item({"mac": "2", "ap_mac": "ap1", "rx_bytes-r": 2.0})
+    clients.process_item({"mac": "3", "ap_mac": "ap2", "rssi": 20})
+    clients.process_item({"mac": "4", "is_wired": True, "sw_mac": "sw1"})
+
+    aggregate = access_point_clients(clients)
+    aggregate.rebuild(use_numpy)
+    assert aggregate.groups.keys() == {"ap1", "ap2"}
+    assert aggregate.groups["ap1"].count == 2
+    assert aggregate.groups["ap1"].sums["rx_bytes_r"] == 3.0
+    assert aggregate.groups["ap1"].mean("rssi") == 40.0
+    assert aggregate.groups["ap1"].mean("satisfaction") is None
+    assert aggregate.groups["ap2"].mean("rssi") == 20.0
+
+    clients.process_item({"mac": "2", "ap_mac": "ap2", "rssi": 30})
+    assert aggregate.groups["ap1"] == GroupStats(
+        1,
+        {"rssi": 40.0, "satisfaction": 0.0, "rx_bytes_r": 1.0, "tx_bytes_r": 0.0},
+        {"rssi": 1, "satisfaction": 0, "rx_bytes_r": 1, "tx_bytes_r": 1},
+    )
+    assert aggregate.groups["ap2"].count == 2
+    assert aggregate.groups["ap2"].mean("rssi") == 25.0
+
+    del clients["1"]
+    assert aggregate.groups.keys() == {"ap2"}
+    clients.process_item({"mac": "5", "ap_mac": "ap3"})
+    assert aggregate.groups["ap3"].count == 1
+
+    incremental = aggregate.groups
+    if aggregation.np is not None:
+        aggregate.rebuild(not use_numpy)
+        assert aggregate.groups == incremental
+
+    aggregate.close()
+    del clients["5"]
+    assert "ap3" in aggregate.groups
+
+
+def test_rebuild_without_numpy(monkeypatch):
+    """Verify rebuilding with NumPy fails clearly when it isn't installed."""
+    clients = Clients(Mock())
+    clients.process_item({"mac": "1", "ap_mac": "ap1"})
+    monkeypatch.setattr(aggregation, "np", None)
+    aggregate = access_point_clients(clients)
+    assert aggregate.groups["ap1"].count == 1
+    with pytest.raises(ValueError, match="NumPy is not installed"):
+        aggregate.rebuild(use_numpy=True)
+
+
+def test_switch_clients():
+    """Verify wired clients are aggregated per switch."""
+    clients = Clients(Mock())
+    clients.process_item(
+        {"mac": "1", "is_wired": True, "sw_mac": "sw1", "wired-rx_bytes-r": 2.0}
+    )
+    clients.process_item({"mac": "2", "is_wired": False, "sw_mac": "sw1"})
+
+    aggregate = switch_clients(clients)
+    assert aggregate.groups.keys() == {"sw1"}
+    assert aggregate.groups["sw1"].count == 1
+    assert aggregate.groups["sw1"].mean("rx_bytes_r") == 2.0
+
+
+@pytest.mark.parametrize("use_numpy", USE_NUMPY)
+def test_switch_poe_power(use_numpy):
+    """Verify port PoE power is summed per device."""
+    devices = {
+        "sw1": Device.from_json(
+            {
+                "port_table": [
+                    {"port_idx": 1, "poe_power": "5.50"},
+                    {"port_idx": 2, "poe_power": "1.25"},
+                    {"port_idx": 3, "poe_power": ""},
+                    {"port_idx": 4, "poe_power": "N/A"},
+                ]
+            }
+        ),
+        "sw2": Device.from_json({"port_table": [{"port_idx": 1}]}),
+    }
+    client = Mock()
+    client.devices.__getitem__ = Mock(side_effect=lambda key: devices[key])
+    ports = Ports(client)
+    ports.process_device(ItemEvent.ADDED, "sw1")
+    ports.process_device(ItemEvent.ADDED, "sw2")
+
+    aggregate = switch_poe_power(ports)
+    aggregate.rebuild(use_numpy)
+    assert aggregate.groups["sw1"].sums["poe_power"] == 6.75
+    assert aggregate.groups["sw1"].counts["poe_power"] == 2
+    assert aggregate.groups["sw1"].count == 4
+    assert aggregate.groups["sw2"].mean("poe_power") is None
+
+    devices["sw1"] = Device.from_json(
+        {"port_table": [{"port_idx": 1, "poe_power": "5.50"}]}
+    )
+    ports.process_device(ItemEvent.CHANGED, "sw1")
+    assert aggregate.groups["sw1"].sums["poe_power"] == 5.5
+    assert aggregate.groups["sw1"].count == 1
+
+
+def test_device_models():
+    """Verify devices are aggregated per model."""
+    devices = Devices(Mock())
+    devices.process_item({"mac": "1", "model": "U7PG2", "num_sta": 10})
+    devices.process_item({"mac": "2", "model": "U7PG2", "num_sta": 20})
+    devices.process_item({"mac": "3"})
+
+    aggregate = device_models(devices)
+    assert aggregate.groups.keys() == {"U7PG2"}
+    assert aggregate.groups["U7PG2"].mean("num_sta") == 15.0
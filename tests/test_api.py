@@ -1,7 +1,11 @@
 """Test API handlers."""
 
+from array import array
+import asyncio
 from collections import defaultdict
-from unittest.mock import AsyncMock, Mock
+import json
+import math
+from unittest.mock import AsyncMock, Mock, call
 
 import pytest
 
@@ -11,8 +15,12 @@ from aiounifi.interfaces.api_handlers import (
     ItemEvent,
     SubscriptionHandler,
 )
-from aiounifi.models.api import ApiResponse
+from aiounifi.models import columns
+from aiounifi.models.api import ApiResponse, RawMode
+from aiounifi.models.client import Client
+from aiounifi.models.device import Device, DevicePortOverrides, Port
 from aiounifi.models.message import Message, MessageKey, Meta
+from aiounifi.models.voucher import Voucher
 
 
 @pytest.mark.parametrize(
@@ -124,6 +132,43 @@ def test_subscription_handler_signal(event_filter, id_filter, events, signaled_e
     assert callback.events == signaled_events
 
 
+def test_subscription_handler_signal_unsubscribed_ids():
+    """Verify signalling ids without subscribers doesn't grow the subscriber map."""
+
+    class TestHandler(SubscriptionHandler):
+        pass
+
+    handler = TestHandler()
+    handler.subscribe(callback := Mock(), ItemEvent.DELETED, "1234")
+    for obj_id in ("1234", "5678", "9012"):
+        handler.signal_subscribers(ItemEvent.ADDED, obj_id)
+        handler.signal_subscribers(ItemEvent.DELETED, obj_id)
+    callback.assert_called_once_with(ItemEvent.DELETED, "1234")
+    assert handler._subscribers.keys() == {"1234"}
+
+
+def test_subscription_handler_unsubscribe_while_signalling():
+    """Verify callbacks can unsubscribe while subscribers are being signalled."""
+
+    class TestHandler(SubscriptionHandler):
+        pass
+
+    handler = TestHandler()
+    calls = []
+
+    def first(event, obj_id):
+        calls.append("first")
+        unsub_first()
+        unsub_second()
+
+    unsub_first = handler.subscribe(first)
+    unsub_second = handler.subscribe(lambda event, obj_id: calls.append("second"))
+    handler.signal_subscribers(ItemEvent.ADDED, "1234")
+    handler.signal_subscribers(ItemEvent.ADDED, "1234")
+    assert calls == ["first", "second"]
+    assert handler._subscribers == {}
+
+
 @pytest.mark.parametrize(
     ("process_filter", "remove_filter", "expected"),
     [
@@ -268,3 +313,489 @@ def test_api_handler_process_message(messages, expected):
         )
 
     assert handler.data == expected
+
+
+@pytest.mark.parametrize(
+    ("item_cls", "raw"),
+    [
+        (
+            Client,
+            {
+                "mac": "00:00:00:00:00:01",
+                "ap_mac": "00:00:00:00:01:01",
+                "is_wired": 0,
+                "rssi": "-60",
+                "rx_bytes-r": 12,
+                "sw_port": None,
+                "unknown_key": "unknown",
+            },
+        ),
+        (
+            Device,
+            {
+                "mac": "00:00:00:00:01:01",
+                "port_table": [{"port_idx": 1, "name": "Port 1"}, {"port_idx": 2}],
+                "speedtest-status": {"latency": 10},
+                "storage": [{"name": "disk"}],
+                "vap_table": [{"essid": "ssid"}],
+                "board_rev": "not a number",
+            },
+        ),
+        (
+            Voucher,
+            {"_id": "1", "duration": 60, "create_time": 0, "status": "VALID_ONE"},
+        ),
+    ],
+)
+def test_api_item_generated_decoder(item_cls, raw):
+    """Verify the generated decoder matches the generic field walk."""
+    item = item_cls.from_json(raw)
+    assert item == item_cls._from_json_generic(raw)
+    assert item.raw is raw
+
+
+def test_api_item_generated_decoder_list_error():
+    """Verify the generated decoder rejects non-list values for list fields."""
+    device = Device.from_json({"port_table": {"port_idx": 1}})
+    with pytest.raises(ValueError, match="Expected port_table to be a list"):
+        device.port_table  # noqa: B018
+    with pytest.raises(ValueError, match="Expected port_table to be a list"):
+        Device._from_json_generic({"port_table": {"port_idx": 1}})
+
+
+def test_api_item_generic_decoder_mode(monkeypatch):
+    """Verify decoder generation can be turned off per class."""
+    monkeypatch.setattr(Client, "generate_decoder", False)
+    client = Client.from_json({"mac": "00:00:00:00:00:01"})
+    assert client.mac == "00:00:00:00:00:01"
+    assert "__api_item_annotations" in Client.__dict__
+
+
+@pytest.mark.parametrize(
+    "output_fields",
+    [
+        None,
+        set(),
+        {"led_override"},
+        {"port_overrides", "outlet_overrides"},
+        {"speedtest_status", "speedtest-status", "state", "name"},
+    ],
+)
+def test_api_item_generated_encoder(output_fields):
+    """Verify the generated encoders match the generic field walk."""
+    device = Device.from_json(
+        {
+            "mac": "00:00:00:00:01:01",
+            "led_override": "off",
+            "name": "Switch",
+            "port_overrides": [{"port_idx": 1, "poe_mode": "auto"}],
+            "speedtest-status": {"latency": 10},
+            "state": 1,
+            "unknown_key": "unknown",
+        }
+    )
+    device.led_override = "on"
+    data = device.to_json(output_fields)
+    assert data == device._to_json_generic(output_fields)
+    assert device.to_json(output_fields) == data
+
+
+def test_api_item_generic_encoder_mode(monkeypatch):
+    """Verify encoder generation can be turned off per class."""
+    monkeypatch.setattr(Client, "generate_encoder", False)
+    client = Client.from_json({"mac": "00:00:00:00:00:01", "unknown_key": 1})
+    assert client.to_json({"mac"}) == {"mac": "00:00:00:00:00:01"}
+
+
+def test_api_handler_process_item_unchanged():
+    """Verify identical payloads don't rebuild items or signal subscribers."""
+
+    class TestHandler(APIHandler):
+        obj_id_key = "mac"
+        item_cls = Client
+
+    handler = TestHandler(Mock())
+    handler.subscribe(callback := Mock())
+
+    handler.process_item({"mac": "1", "ip": "10.0.0.1"})
+    callback.assert_called_once_with(ItemEvent.ADDED, "1")
+    item = handler["1"]
+
+    callback.reset_mock()
+    handler.process_item({"mac": "1", "ip": "10.0.0.1"})
+    callback.assert_not_called()
+    assert handler["1"] is item
+
+    handler.process_item({"mac": "1", "ip": "10.0.0.2"})
+    callback.assert_called_once_with(ItemEvent.CHANGED, "1")
+    assert handler["1"].ip == "10.0.0.2"
+
+
+def test_api_item_diff():
+    """Verify diff lists the fields with different values."""
+    client = Client.from_json({"mac": "1", "ip": "10.0.0.1", "hostname": "a"})
+    assert client.diff(client) == frozenset()
+    other = Client.from_json({"mac": "1", "ip": "10.0.0.2", "hostname": "a"})
+    assert client.diff(other) == frozenset({"ip"})
+    other = Client.from_json({"mac": "1", "unknown_key": True})
+    assert client.diff(other) == frozenset({"ip", "hostname"})
+
+
+def test_api_handler_subscribe_changes():
+    """Verify change subscribers get the changed fields, filtered on field."""
+
+    class TestHandler(APIHandler):
+        obj_id_key = "mac"
+        item_cls = Client
+
+    handler = TestHandler(Mock())
+    all_changes = Mock()
+    unsub_all = handler.subscribe_changes(all_changes)
+    unsub_ip = handler.subscribe_changes(ip_changes := Mock(), "ip", "1")
+
+    handler.process_item({"mac": "1", "ip": "10.0.0.1", "hostname": "a"})
+    all_changes.assert_not_called()
+    ip_changes.assert_not_called()
+
+    handler.process_item({"mac": "1", "ip": "10.0.0.1", "hostname": "b"})
+    all_changes.assert_called_once_with("1", frozenset({"hostname"}))
+    ip_changes.assert_not_called()
+
+    all_changes.reset_mock()
+    handler.process_item({"mac": "1", "ip": "10.0.0.2", "hostname": "c"})
+    all_changes.assert_called_once_with("1", frozenset({"ip", "hostname"}))
+    ip_changes.assert_called_once_with("1", frozenset({"ip", "hostname"}))
+
+    # Only raw differs, no field changed
+    all_changes.reset_mock()
+    handler.process_item(
+        {"mac": "1", "ip": "10.0.0.2", "hostname": "c", "unknown_key": 1}
+    )
+    all_changes.assert_not_called()
+
+    unsub_ip()
+    unsub_ip()
+    assert list(handler._change_subscribers) == [ID_FILTER_ALL]
+    unsub_all()
+    assert handler._change_subscribers == {}
+    assert handler._subscribers == {}
+
+
+def test_api_handler_subscribe_changes_nested():
+    """Verify change subscribers get the fields of their item if others update."""
+
+    class TestHandler(APIHandler):
+        obj_id_key = "mac"
+        item_cls = Client
+
+    handler = TestHandler(Mock())
+    handler.process_item({"mac": "1", "ip": "10.0.0.1", "hostname": "a"})
+    handler.process_item({"mac": "2", "ip": "10.0.0.2", "hostname": "a"})
+
+    def update_other(obj_id, changed_fields):
+        if obj_id == "1":
+            handler.process_item({"mac": "2", "ip": "10.0.0.3", "hostname": "a"})
+
+    handler.subscribe_changes(update_other)
+    handler.subscribe_changes(changes := Mock())
+    handler.process_item({"mac": "1", "ip": "10.0.0.1", "hostname": "b"})
+    assert changes.call_args_list == [
+        call("2", frozenset({"ip"})),
+        call("1", frozenset({"hostname"})),
+    ]
+
+
+async def test_api_handler_update_remove_stale():
+    """Verify update can remove items missing from the response."""
+    client = Mock()
+    client.get = AsyncMock(
+        return_value=ApiResponse(data=[{"mac": "1"}, {"mac": "2"}, {"mac": "3"}])
+    )
+
+    class TestHandler(APIHandler):
+        obj_id_key = "mac"
+        item_cls = Client
+        list_endpoint = "API_REQUEST"  # type: ignore
+
+    handler = TestHandler(client)
+    await handler.update()
+    handler.subscribe(callback := Mock())
+
+    client.get.return_value = ApiResponse(data=[{"mac": "1"}, {"mac": "3"}])
+    await handler.update()
+    assert set(handler) == {"1", "2", "3"}
+    callback.assert_not_called()
+
+    await handler.update(remove_stale=True)
+    assert set(handler) == {"1", "3"}
+    callback.assert_called_once_with(ItemEvent.DELETED, "2")
+
+    # Items added between updates are removed if missing from the next update
+    handler.process_item({"mac": "4"})
+    TestHandler.remove_stale_items = True
+    client.get.return_value = ApiResponse(data=[{"mac": "3", "ip": "10.0.0.3"}])
+    await handler.update()
+    assert set(handler) == {"3"}
+    assert handler._generations == {"3": handler._generation}
+
+    # Items added while the request is in flight are kept
+    release = asyncio.Event()
+
+    async def get(endpoint):
+        await release.wait()
+        return ApiResponse(data=[{"mac": "3", "ip": "10.0.0.3"}])
+
+    client.get = AsyncMock(side_effect=get)
+    callback.reset_mock()
+    update = asyncio.create_task(handler.update())
+    while not client.get.called:
+        await asyncio.sleep(0)
+    handler.process_item({"mac": "5"})
+    release.set()
+    await update
+    assert set(handler) == {"3", "5"}
+    callback.assert_called_once_with(ItemEvent.ADDED, "5")
+    TestHandler.remove_stale_items = False
+
+
+async def test_api_handler_update_single_flight():
+    """Verify concurrent updates share one request and max_age skips updates."""
+    client = Mock()
+    release = asyncio.Event()
+
+    async def get(endpoint):
+        await release.wait()
+        return ApiResponse(data=[{"mac": "1"}])
+
+    client.get = AsyncMock(side_effect=get)
+
+    class TestHandler(APIHandler):
+        obj_id_key = "mac"
+        item_cls = Client
+        list_endpoint = "API_REQUEST"  # type: ignore
+
+    handler = TestHandler(client)
+    handler.process_item({"mac": "2"})
+    handler.subscribe(callback := Mock())
+
+    updates = [
+        asyncio.create_task(handler.update()),
+        asyncio.create_task(handler.update(remove_stale=True)),
+        asyncio.create_task(handler.update()),
+    ]
+    await asyncio.sleep(0)
+    updates[0].cancel()
+    release.set()
+    await asyncio.gather(*updates[1:])
+    assert updates[0].cancelled()
+    assert client.get.call_count == 1
+    assert callback.call_args_list == [
+        call(ItemEvent.ADDED, "1"),
+        call(ItemEvent.DELETED, "2"),
+    ]
+
+    await handler.update(max_age=60)
+    assert client.get.call_count == 1
+    await handler.update(max_age=0)
+    assert client.get.call_count == 2
+
+    client.get.side_effect = RuntimeError
+    updates = [asyncio.create_task(handler.update()) for _ in range(2)]
+    results = await asyncio.gather(*updates, return_exceptions=True)
+    assert [type(result) for result in results] == [RuntimeError, RuntimeError]
+    assert client.get.call_count == 3
+    assert handler._update_task is None
+
+
+def test_api_item_replace():
+    """Verify replace copies the item once, applying non-None values in order."""
+    override = DevicePortOverrides.from_json(
+        {"port_idx": 1, "name": "a", "poe_mode": "off", "unknown_key": True}
+    )
+    replaced = override.replace(
+        DevicePortOverrides(port_idx=1, poe_mode="auto"),
+        DevicePortOverrides(port_idx=1, poe_mode="pasv24", name="b"),
+    )
+    assert replaced is not override
+    assert replaced.raw is override.raw
+    assert (replaced.port_idx, replaced.name, replaced.poe_mode) == (1, "b", "pasv24")
+    assert override.poe_mode == "off"
+    assert replaced.to_json() == {
+        "port_idx": 1,
+        "name": "b",
+        "poe_mode": "pasv24",
+        "unknown_key": True,
+    }
+    assert override.replace() == override
+
+
+@pytest.mark.parametrize(
+    ("raw_mode", "raw"),
+    [
+        (RawMode.FULL, {"mac": "1", "sw_port": 2, "unknown_key": True}),
+        (RawMode.UNKNOWN, {"unknown_key": True}),
+        (RawMode.NONE, {}),
+    ],
+)
+def test_api_item_compact(raw_mode, raw):
+    """Verify compact variants use slots and retain raw per raw mode."""
+    compact_cls = Client.compact(raw_mode)
+    assert compact_cls is Client.compact(raw_mode)
+    assert compact_cls.compact(RawMode.FULL) is Client.compact()
+
+    client = compact_cls.from_json({"mac": "1", "sw_port": 2, "unknown_key": True})
+    assert isinstance(client, Client)
+    assert not hasattr(client, "__dict__")
+    assert (client.mac, client.switch_port, client.raw) == ("1", 2, raw)
+    expected = Client.from_json({"mac": "1", "sw_port": 2, "unknown_key": True})
+    if raw_mode is RawMode.NONE:
+        del expected.raw["unknown_key"]
+    assert client.to_json() == expected.to_json()
+
+    replaced = client.replace(compact_cls(mac="1", switch_port=3))
+    assert replaced.raw is client.raw
+    assert replaced.diff(client) == frozenset({"switch_port"})
+
+    client = compact_cls._from_json_generic(
+        {"mac": "1", "sw_port": 2, "unknown_key": True}
+    )
+    assert client.raw == raw
+
+
+def test_api_item_compact_nested():
+    """Verify nested items of compact variants are compact too."""
+    device = Device.compact(RawMode.UNKNOWN).from_json(
+        {"mac": "1", "port_table": [{"port_idx": 1, "up": True}], "uplink": {}}
+    )
+    assert isinstance(device.port_table[0], Port)
+    assert not hasattr(device.port_table[0], "__dict__")
+    assert not hasattr(device.uplink, "__dict__")
+    assert device.port_table[0].name == "Port 1"
+    assert device.id == ""
+
+
+def test_api_handler_use_compact_items():
+    """Verify handlers can store compact items."""
+
+    class TestHandler(APIHandler):
+        obj_id_key = "mac"
+        item_cls = Client
+
+    handler = TestHandler(Mock())
+    handler.use_compact_items(RawMode.NONE)
+    handler.process_item({"mac": "1", "ip": "10.0.0.1"})
+    assert isinstance(handler["1"], Client)
+    assert handler["1"].raw == {}
+    assert TestHandler.item_cls is Client
+
+
+@pytest.mark.parametrize(
+    "use_numpy",
+    [
+        False,
+        pytest.param(
+            True,
+            marks=pytest.mark.skipif(columns.np is None, reason="numpy not installed"),
+        ),
+    ],
+)
+def test_api_handler_snapshot(use_numpy, monkeypatch):
+    """Verify snapshot collects fields into typed columns."""
+
+    class TestHandler(APIHandler):
+        obj_id_key = "mac"
+        item_cls = Client
+
+    handler = TestHandler(Mock())
+    handler.process_item(
+        {"mac": "1", "rssi": 40, "tx_bytes": 10, "tx_bytes-r": 1.5, "is_wired": True}
+    )
+    handler.process_item({"mac": "2", "tx_bytes": 2**64, "hostname": "two"})
+
+    snapshot = handler.snapshot(
+        ["rssi", "tx_bytes_r", "is_wired", "hostname", "tx_bytes", "satisfaction"],
+        use_numpy,
+    )
+    assert list(snapshot["rssi"][:1]) == [40.0]
+    assert math.isnan(snapshot["rssi"][1])
+    assert list(snapshot["tx_bytes_r"]) == [1.5, 0.0]
+    assert list(snapshot["is_wired"]) == [True, False]
+    assert snapshot["hostname"] == ["", "two"]
+    # Values that don't fit the column type fall back to a list
+    assert snapshot["tx_bytes"] == [10, 2**64]
+    for name in ("rssi", "tx_bytes_r", "is_wired"):
+        assert not isinstance(snapshot[name], list)
+        if use_numpy:
+            assert snapshot[name].dtype.kind == ("b" if name == "is_wired" else "f")
+
+    assert list(handler.snapshot(["tx_bytes_r"], use_numpy)) == ["tx_bytes_r"]
+    assert handler.snapshot([]) == {}
+    handler.clear()
+    assert list(handler.snapshot(["ip", "rssi"], use_numpy)["rssi"]) == []
+    with pytest.raises(ValueError, match="Client has no fields unknown"):
+        handler.snapshot(["rssi", "unknown"])
+
+    monkeypatch.setattr(columns, "np", None)
+    assert isinstance(handler.snapshot(["rssi"])["rssi"], array)
+    with pytest.raises(ValueError, match="NumPy is not installed"):
+        handler.snapshot(["rssi"], use_numpy=True)
+
+
+def test_api_item_compact_projection():
+    """Verify projected variants only decode and store the requested fields."""
+    projected_cls = Client.compact(RawMode.NONE, ("mac", "ip"))
+    assert projected_cls is Client.compact(RawMode.NONE, ["ip", "mac"])
+    assert projected_cls is not Client.compact(RawMode.NONE)
+
+    client = projected_cls.from_json({"mac": "1", "ip": "10.0.0.1", "hostname": "a"})
+    assert isinstance(client, Client)
+    assert (client.mac, client.ip) == ("1", "10.0.0.1")
+    assert client.to_json() == {"mac": "1", "ip": "10.0.0.1"}
+    with pytest.raises(AttributeError, match="Client.hostname is not part of"):
+        client.hostname  # noqa: B018
+    assert not hasattr(client, "hostname")
+
+    with pytest.raises(ValueError, match="Client has no fields unknown_1, unknown_2"):
+        Client.compact(projection=("mac", "unknown_2", "unknown_1"))
+
+
+def test_api_handler_use_compact_items_projection():
+    """Verify handlers can store projected items."""
+
+    class TestHandler(APIHandler):
+        obj_id_key = "mac"
+        item_cls = Client
+        secondary_indexes = {"ip": ("ip",), "hostname": ("hostname",)}
+
+    handler = TestHandler(Mock())
+    handler.use_compact_items(RawMode.NONE, ("mac", "ip"))
+    handler.process_item({"mac": "1", "ip": "10.0.0.1", "hostname": "a"})
+    assert handler.lookup("ip", "10.0.0.1") == [handler["1"]]
+    assert handler.lookup("hostname", "a") == []
+
+
+def test_api_item_intern_fields():
+    """Verify configured string fields share a single object across items."""
+    raw = [
+        json.loads(json.dumps({"mac": "1", "essid": "ssid", "ap_mac": "ap"}))
+        for _ in range(2)
+    ]
+    assert raw[0]["essid"] is not raw[1]["essid"]
+
+    first, second = (Client.from_json(data) for data in raw)
+    assert first.essid is second.essid
+    assert first.access_point_mac is second.access_point_mac
+    assert first.raw["essid"] is first.essid
+    assert first.raw["ap_mac"] is second.raw["ap_mac"]
+
+    raw = json.loads(json.dumps({"mac": "1", "essid": "ssid"}))
+    assert Client._from_json_generic(raw).essid is first.essid
+    assert Client.compact(RawMode.NONE).from_json(raw).essid is first.essid
+
+    # Values converted to a string are neither interned nor written back
+    raw = {"mac": "1", "radio": 5}
+    client = Client.from_json(raw)
+    assert client.radio == "5"
+    assert raw == {"mac": "1", "radio": 5}
+    assert client.raw is raw
+    assert Client._from_json_generic({"mac": "1", "radio": 5}).radio == "5"
@@ -1,5 +1,6 @@
 """Confirm the behavior of the REST client."""
 
+import asyncio
 from collections import defaultdict
 from http import HTTPStatus
 import json
@@ -12,8 +13,12 @@ import pytest
 
 from aiounifi import errors
 from aiounifi.client import UnifiClient
-from aiounifi.models.api import ApiEndpoint
-from aiounifi.models.configuration import Configuration
+from aiounifi.models.api import ApiEndpoint, ApiResponse
+from aiounifi.models.configuration import (
+    Configuration,
+    ConnectionPool,
+    RetryPolicy,
+)
 
 
 @pytest.mark.parametrize(
@@ -62,6 +67,124 @@ async def test_connect(
             await client.session.close()
 
 
+async def test_connect_connection_pool():
+    """Verify the session is created with the connection pool settings."""
+    config = Configuration("host", username="user", password="pass")
+    config.connection_pool = ConnectionPool(
+        limit=10, limit_per_host=4, keepalive_timeout=60, dns_cache_ttl=300
+    )
+    client = UnifiClient(config)
+    with patch(
+        "aiounifi.client.aiohttp.ClientSession.get", new_callable=AsyncMock
+    ) as get_method:
+        get_method.return_value = Mock(status=HTTPStatus.FOUND)
+        await client.connect()
+    connector = client.session.connector
+    assert connector.limit == 10
+    assert connector.limit_per_host == 4
+    assert connector._keepalive_timeout == 60
+    assert connector._cached_hosts._ttl == 300
+    await client.session.close()
+    assert connector.closed
+
+
+async def test_connect_shared_connector():
+    """Verify clients of different sites share a connector they don't own."""
+    connector = aiohttp.TCPConnector()
+    clients = [
+        UnifiClient(
+            Configuration(
+                "host", username="user", password="pass", site=site, connector=connector
+            )
+        )
+        for site in ("default", "other")
+    ]
+    with patch(
+        "aiounifi.client.aiohttp.ClientSession.get", new_callable=AsyncMock
+    ) as get_method:
+        get_method.return_value = Mock(status=HTTPStatus.FOUND)
+        for client in clients:
+            await client.connect()
+    assert [client.session.connector for client in clients] == [connector] * 2
+    for client in clients:
+        await client.session.close()
+    assert not connector.closed
+    await connector.close()
+
+
+@pytest.mark.parametrize("status_code", [HTTPStatus.FOUND, HTTPStatus.NOT_FOUND])
+async def test_connect_caller_session(status_code):
+    """Verify a session of the caller is used, raising errors per request."""
+    session = AsyncMock()
+    session.get.return_value = Mock(status=status_code)
+    client = UnifiClient(
+        Configuration("host", username="user", password="pass", session=session)
+    )
+    if status_code == HTTPStatus.NOT_FOUND:
+        with pytest.raises(errors.AiounifiException):
+            await client.connect()
+        session.close.assert_not_called()
+        return
+
+    await client.connect()
+    assert client.session is session
+    session.get.assert_called_with(
+        "https://host:8443",
+        allow_redirects=False,
+        ssl=False,
+        raise_for_status=errors.raise_for_status,
+    )
+
+    response = AsyncMock()
+    response.__aenter__.return_value = response
+    response.json.return_value = {}
+    session.request = Mock(return_value=response)
+    await client.endpoint_request("get", ApiEndpoint(path="/endpoint"))
+    session.request.assert_called_with(
+        method="get",
+        url="/api/s/default/endpoint",
+        json=None,
+        ssl=False,
+        raise_for_status=errors.raise_for_status,
+        headers={},
+    )
+
+
+async def test_caller_session_unmodified():
+    """Verify a session of the caller keeps its cookies and headers."""
+    session = Mock(headers={"user-agent": "caller"})
+    session.get = AsyncMock(return_value=Mock(status=HTTPStatus.OK))
+    session.post = AsyncMock(
+        return_value=Mock(
+            content_type="application/json",
+            headers={"x-csrf-token": "token123"},
+            json=AsyncMock(return_value={}),
+        )
+    )
+    response = AsyncMock()
+    response.__aenter__.return_value = response
+    response.json.return_value = {}
+    session.request = Mock(return_value=response)
+
+    client = UnifiClient(
+        Configuration("host", username="user", password="pass", session=session)
+    )
+    await client.connect()
+    await client.login()
+    session.cookie_jar.clear_domain.assert_not_called()
+    assert session.headers == {"user-agent": "caller"}
+
+    await client.endpoint_request("get", ApiEndpoint(path="/endpoint"))
+    session.request.assert_called_with(
+        method="get",
+        url="/api/s/default/endpoint",
+        json=None,
+        ssl=False,
+        raise_for_status=errors.raise_for_status,
+        headers={"x-csrf-token": "token123"},
+    )
+
+
 @pytest.mark.parametrize(
     ("is_unifi_os", "response", "response_data", "expected_headers", "expected_error"),
     [
@@ -133,7 +256,8 @@ async def test_login(
                 "https://host:8443/api/login", json=expected_json
             )
 
-        assert expected_headers == session.headers
+        assert expected_headers == client._headers
+        assert session.headers == {}
 
 
 @pytest.mark.parametrize(
@@ -180,8 +304,9 @@ async def test_endpoint_request():
     # normal request, already authenticated
     await client.endpoint_request("get", ApiEndpoint(path="/endpoint"))
     client.session.request.assert_called_with(
-        method="get", url="/api/s/default/endpoint", json=None, ssl=False
+        method="get", url="/api/s/default/endpoint", json=None, ssl=False, headers={}
     )
+    response.json.assert_called_with(loads=client.config.codec.loads)
 
     # auth session expired, need to relogin
     def _response(*args, **kwargs):
@@ -198,12 +323,219 @@ async def test_endpoint_request():
     client.login.assert_called_once()
     client.session.request.assert_has_calls(
         [
-            call(method="get", url="/api/s/default/endpoint", json=None, ssl=False),
-            call(method="get", url="/api/s/default/endpoint", json=None, ssl=False),
+            call(
+                method="get",
+                url="/api/s/default/endpoint",
+                json=None,
+                ssl=False,
+                headers={},
+            ),
+            call(
+                method="get",
+                url="/api/s/default/endpoint",
+                json=None,
+                ssl=False,
+                headers={},
+            ),
         ]
     )
 
 
+async def test_endpoint_request_scheduler():
+    """Verify requests wait for a slot of the scheduler."""
+    config = Configuration("host", username="user", password="pass")
+    config.max_concurrent_requests = 1
+    client = UnifiClient(config)
+    with patch(
+        "aiounifi.client.aiohttp.ClientSession.get", new_callable=AsyncMock
+    ) as get_method:
+        get_method.return_value = Mock(status=HTTPStatus.FOUND)
+        await client.connect()
+        await client.session.close()
+    assert client.scheduler.max_in_flight == 1
+
+    release = asyncio.Event()
+
+    class Response:
+        status = 204
+
+        async def __aenter__(self):
+            await release.wait()
+            return self
+
+        async def __aexit__(self, *args):
+            return None
+
+    client.session = Mock(request=Mock(side_effect=lambda **kwargs: Response()))
+    requests = [
+        asyncio.create_task(client.get(ApiEndpoint(path="/stat/sta"))),
+        asyncio.create_task(client.get(ApiEndpoint(path="/stat/device"))),
+        asyncio.create_task(client.post(ApiEndpoint(path="/cmd/devmgr"), None, {})),
+    ]
+    await asyncio.sleep(0)
+    assert client.session.request.call_count == 1
+
+    release.set()
+    await asyncio.gather(*requests)
+    assert [call.kwargs["url"] for call in client.session.request.call_args_list] == [
+        "/api/s/default/stat/sta",
+        "/api/s/default/cmd/devmgr",
+        "/api/s/default/stat/device",
+    ]
+    assert client.scheduler.in_flight == 0
+
+
+@pytest.mark.parametrize("login_error", [None, errors.RequestError])
+async def test_endpoint_request_single_relogin(login_error):
+    """Verify requests rejected together share one re-login."""
+    client = UnifiClient(Configuration("host", username="user", password="pass"))
+    logged_in = False
+    release = asyncio.Event()
+
+    async def login():
+        nonlocal logged_in
+        await release.wait()
+        if login_error:
+            raise login_error
+        logged_in = True
+
+    client.login = AsyncMock(side_effect=login)
+
+    class Response:
+        status = 200
+
+        async def __aenter__(self):
+            await asyncio.sleep(0)
+            if not logged_in:
+                raise errors.LoginRequired
+            return self
+
+        async def __aexit__(self, *args):
+            return None
+
+        async def json(self, loads):
+            return {}
+
+    client.session = Mock(request=Mock(side_effect=lambda **kwargs: Response()))
+
+    def request():
+        return asyncio.create_task(
+            client.endpoint_request("get", ApiEndpoint(path="/endpoint"))
+        )
+
+    rejected = [request() for _ in range(5)]
+    for _ in range(3):
+        await asyncio.sleep(0)
+    parked = request()
+    await asyncio.sleep(0)
+    assert client.session.request.call_count == 5
+
+    release.set()
+    results = await asyncio.gather(*rejected, parked, return_exceptions=True)
+    if login_error:
+        # Only the request that logged in sees the login error, the others are
+        # replayed and rejected again. The parked request is sent after the
+        # failed login and tries to log in once more.
+        assert [type(result) for result in results] == [
+            login_error,
+            *[errors.LoginRequired] * 4,
+            login_error,
+        ]
+        assert client.login.call_count == 2
+    else:
+        assert results == [ApiResponse()] * 6
+        client.login.assert_called_once()
+        # The parked request is only sent once the login completed
+        assert client.session.request.call_count == 11
+
+
+def test_retry_policy_delay():
+    """Verify retry delays back off, honour Retry-After and give up."""
+    policy = RetryPolicy(max_retries=3, base_delay=1, max_delay=3)
+    for retry, limit in enumerate((1, 2, 3)):
+        assert 0 <= policy.delay(retry, None) <= limit
+    assert policy.delay(3, None) is None
+    assert policy.delay(0, 2.5) >= 2.5
+    assert policy.delay(0, 4) is None
+
+
+@pytest.mark.parametrize(
+    ("method", "endpoint", "error", "budget", "expected_requests"),
+    [
+        ("get", ApiEndpoint(path="/stat/sta"), errors.ServiceUnavailable, 10, 3),
+        ("get", ApiEndpoint(path="/stat/sta"), errors.BadGateway, 10, 3),
+        ("put", ApiEndpoint(path="/rest/device"), errors.TooManyRequests, 10, 3),
+        ("post", ApiEndpoint(path="/cmd/devmgr"), errors.ServiceUnavailable, 10, 1),
+        (
+            "post",
+            ApiEndpoint(path="/cmd/stat", idempotent=True),
+            errors.ServiceUnavailable,
+            10,
+            3,
+        ),
+        (
+            "get",
+            ApiEndpoint(path="/stat/sta", idempotent=False),
+            errors.ServiceUnavailable,
+            10,
+            1,
+        ),
+        ("get", ApiEndpoint(path="/stat/sta"), errors.ServiceUnavailable, 1, 2),
+        ("get", ApiEndpoint(path="/stat/sta"), errors.ResponseError, 10, 1),
+    ],
+)
+async def test_endpoint_request_retry(
+    method, endpoint, error, budget, expected_requests
+):
+    """Verify transient errors are retried for idempotent requests within budget."""
+    config = Configuration("host", username="user", password="pass")
+    config.retry_policy = RetryPolicy(base_delay=0, budget_capacity=budget)
+    client = UnifiClient(config)
+    failures = 2
+
+    class Response:
+        status = 200
+
+        async def __aenter__(self):
+            nonlocal failures
+            if failures:
+                failures -= 1
+                raise error
+            return self
+
+        async def __aexit__(self, *args):
+            return None
+
+        async def json(self, loads):
+            return {}
+
+    client.session = Mock(request=Mock(side_effect=lambda **kwargs: Response()))
+    if expected_requests == 3:
+        assert await client.endpoint_request(method, endpoint) == ApiResponse()
+    else:
+        with pytest.raises(error):
+            await client.endpoint_request(method, endpoint)
+    assert client.session.request.call_count == expected_requests
+
+
+async def test_endpoint_request_retry_after():
+    """Verify a Retry-After longer than the policy allows isn't waited for."""
+    config = Configuration("host", username="user", password="pass")
+    config.retry_policy = RetryPolicy(base_delay=0, max_delay=1)
+    client = UnifiClient(config)
+    error = errors.TooManyRequests()
+    error.retry_after = 60
+    client.session = Mock(request=Mock(side_effect=error))
+
+    with (
+        patch("aiounifi.client.asyncio.sleep") as sleep,
+        pytest.raises(errors.TooManyRequests),
+    ):
+        await client.endpoint_request("get", ApiEndpoint(path="/stat/sta"))
+    assert client.session.request.call_count == 1
+    sleep.assert_not_called()
+
+
 @pytest.mark.parametrize(
     (
         "unifi_os",
@@ -340,6 +672,7 @@ async def test_websocket_listener(
 
             client.session.ws_connect.assert_called_with(
                 expected_url,
+                headers={},
                 ssl=False,
                 heartbeat=15,
                 compress=12,
@@ -351,7 +684,7 @@ async def test_websocket_listener(
                 call(
                     "Connected to UniFi websocket %s, headers: %s, cookiejar: %s",
                     expected_url,
-                    client.session.headers,
+                    {},
                     client.session.cookie_jar._cookies,
                 ),
             )
@@ -4,6 +4,7 @@ pytest --cov-report term-missing --cov=aiounifi.clients tests/test_clients.py
 """
 
 from typing import Any
+from unittest.mock import Mock
 
 import pytest
 
@@ -94,3 +95,46 @@ async def test_clients(
     await assert_handler_request(
         Clients, method_name, request_args, api_request, expected_error
     )
+
+
+def test_secondary_indexes():
+    """Verify clients can be looked up on secondary indexes."""
+    clients = Clients(Mock())
+    clients.process_item(
+        {"mac": "1", "ip": "10.0.0.1", "sw_mac": "sw", "sw_port": 1, "ap_mac": ""}
+    )
+    clients.process_item(
+        {"mac": "2", "ip": "10.0.0.2", "hostname": "two", "ap_mac": "ap"}
+    )
+    clients.process_item({"mac": "3", "hostname": "three", "ap_mac": "ap"})
+
+    assert [client.mac for client in clients.lookup("ip", "10.0.0.1")] == ["1"]
+    assert [client.mac for client in clients.lookup("hostname", "two")] == ["2"]
+    assert [client.mac for client in clients.lookup("switch_port", "sw", 1)] == ["1"]
+    assert [client.mac for client in clients.lookup("access_point", "ap")] == [
+        "2",
+        "3",
+    ]
+    assert clients.lookup("ip", "") == []
+    assert clients.lookup("access_point", "") == []
+
+    clients.process_item({"mac": "1", "ip": "10.0.0.3", "sw_mac": "sw", "sw_port": 2})
+    assert clients.lookup("ip", "10.0.0.1") == []
+    assert clients.lookup("switch_port", "sw", 1) == []
+    assert clients.lookup("switch_port", "sw", 2) == [clients["1"]]
+
+    # Items edited in place are moved from the index keys they were stored under
+    clients["1"].ip = "10.0.0.9"
+    clients.process_item({"mac": "1", "ip": "10.0.0.4", "sw_mac": "sw", "sw_port": 2})
+    assert clients.lookup("ip", "10.0.0.3") == []
+    assert clients.lookup("ip", "10.0.0.4") == [clients["1"]]
+
+    del clients["2"]
+    assert clients.lookup("access_point", "ap") == [clients["3"]]
+    del clients["3"]
+    assert clients._indexes == {
+        "ip": {"10.0.0.4": {"1": None}},
+        "hostname": {},
+        "switch_port": {("sw", 2): {"1": None}},
+        "access_point": {},
+    }
@@ -4,11 +4,15 @@ pytest --cov-report term-missing --cov=aiounifi.devices tests/test_devices.py
 """
 
 from typing import Any
+from unittest.mock import AsyncMock, Mock
 
 import pytest
 
+from aiounifi import errors
+from aiounifi.client import UnifiClient
+from aiounifi.interfaces.api_handlers import ItemEvent
 from aiounifi.interfaces.devices import Devices, _merge_overrides
-from aiounifi.models.api import ApiEndpoint
+from aiounifi.models.api import ApiEndpoint, ApiResponse, RawMode
 from aiounifi.models.device import (
     Device,
     DeviceOutletOverrides,
@@ -111,6 +115,27 @@ def test_repr(obj, expected):
                 DeviceOutletOverrides(index=4, relay_state=True),
             ],
         ),
+        (
+            [
+                DevicePortOverrides(port_idx=3, poe_mode="off"),
+                DevicePortOverrides(port_idx=5, name="five"),
+            ],
+            [
+                DevicePortOverrides(port_idx=6, poe_mode="auto"),
+                DevicePortOverrides(port_idx=5, poe_mode="auto"),
+                DevicePortOverrides(port_idx=2, poe_mode="auto"),
+                DevicePortOverrides(port_idx=1, poe_mode="auto"),
+                DevicePortOverrides(port_idx=5, name="5"),
+            ],
+            "port_idx",
+            [
+                DevicePortOverrides(port_idx=1, poe_mode="auto"),
+                DevicePortOverrides(port_idx=2, poe_mode="auto"),
+                DevicePortOverrides(port_idx=3, poe_mode="off"),
+                DevicePortOverrides(port_idx=5, name="5", poe_mode="auto"),
+                DevicePortOverrides(port_idx=6, poe_mode="auto"),
+            ],
+        ),
     ],
 )
 def test_merge_overrides(existing_overrides, new_overrides, index_attr, expected):
@@ -119,6 +144,19 @@ def test_merge_overrides(existing_overrides, new_overrides, index_attr, expected
     assert expected == computed_overrides
 
 
+def test_merge_overrides_shares_raw():
+    """Verify merged overrides keep the raw data of the existing override."""
+    existing = DevicePortOverrides.from_json(
+        {"port_idx": 1, "poe_mode": "off", "unknown_key": True}
+    )
+    (merged,) = _merge_overrides(
+        [existing], [DevicePortOverrides(port_idx=1, poe_mode="auto")], "port_idx"
+    )
+    assert merged.raw is existing.raw
+    assert merged.to_json() == {"port_idx": 1, "poe_mode": "auto", "unknown_key": True}
+    assert existing.to_json()["poe_mode"] == "off"
+
+
 # async def test_device_websocket(
 #     unifi_controller: UnifiClient, new_ws_data_fn: Callable[[dict[str, Any]], None]
 # ) -> None:
@@ -319,6 +357,55 @@ async def test_devices(
     )
 
 
+@pytest.mark.parametrize(
+    ("method_name", "args", "field_name"),
+    [
+        ("set_led_status", ("off",), "led_override"),
+        (
+            "set_outlet_overrides",
+            (DeviceOutletOverrides(index=1, relay_state=False),),
+            "outlet_overrides",
+        ),
+        (
+            "set_port_overrides",
+            (DevicePortOverrides(port_idx=1, poe_mode="off"),),
+            "port_overrides",
+        ),
+    ],
+)
+async def test_devices_update_from_response(method_name, args, field_name):
+    """Verify the stored device only changes with the response of a save."""
+    raw = {
+        "_id": "1",
+        "mac": "00:00:00:00:01:01",
+        "led_override": "on",
+        "outlet_overrides": [{"index": 1, "relay_state": True}],
+        "port_overrides": [{"port_idx": 1, "poe_mode": "auto"}],
+    }
+    client = UnifiClient(Mock)
+    client.endpoint_request = AsyncMock(side_effect=errors.ServiceUnavailable)
+    devices = client.devices
+    devices.process_raw([raw])
+    device = devices["00:00:00:00:01:01"]
+    stored = getattr(device, field_name)
+
+    with pytest.raises(errors.ServiceUnavailable):
+        await getattr(devices, method_name)(device, *args)
+    assert devices["00:00:00:00:01:01"] is device
+    assert getattr(device, field_name) == stored
+
+    # An identical sync after the failed save keeps the controller state
+    devices.process_raw([dict(raw)])
+    assert getattr(devices["00:00:00:00:01:01"], field_name) == stored
+
+    client.endpoint_request = AsyncMock(
+        side_effect=lambda **kwargs: ApiResponse(data=[{**raw, **kwargs["data"]}])
+    )
+    await getattr(devices, method_name)(device, *args)
+    assert getattr(device, field_name) == stored
+    assert getattr(devices["00:00:00:00:01:01"], field_name) != stored
+
+
 def test_device_id():
     """Confirm `id` property returns the `device_id` attribute."""
     assert TEST_DEVICE_1.device_id == TEST_DEVICE_1.id
@@ -334,3 +421,182 @@ def test_device_id():
 def test_port_name(port: Port, expected_name):
     """Verify behavior of the `name` property."""
     assert port.name == expected_name
+
+
+def test_lazy_tables():
+    """Verify nested tables are decoded on first access and cached."""
+    device = Device.from_json(
+        {
+            "mac": "1",
+            "port_table": [
+                {"port_idx": 1, "mac_table": [{"mac": "2", "vlan": 1}]},
+            ],
+        }
+    )
+    assert "port_table" not in vars(device)
+    assert "radio_table" not in vars(device)
+
+    (port,) = device.port_table
+    assert device.port_table is device.port_table
+    assert isinstance(port, Port)
+    assert "mac_table" not in vars(port)
+    assert port.mac_table[0].mac == "2"
+    assert device.radio_table == []
+
+    copied = device.replace()
+    assert copied.port_table is device.port_table
+    assert copied.lldp_table == []
+    assert Device.from_json(device.raw) == device
+
+    assert Device(port_table=[port]).port_table == [port]
+    assert Device.compact().from_json(device.raw).port_table[0].mac_table[0].vlan == 1
+
+
+@pytest.mark.parametrize(
+    ("raw_mode", "lazy"),
+    [(RawMode.FULL, True), (RawMode.UNKNOWN, False), (RawMode.NONE, False)],
+)
+def test_lazy_tables_compact(raw_mode, lazy):
+    """Verify compact devices decode tables lazily if they retain full raw data."""
+    compact_cls = Device.compact(raw_mode)
+    device = compact_cls.from_json({"mac": "1", "port_table": [{"port_idx": 1}]})
+    if lazy:
+        # The slot stays empty until the table is accessed
+        with pytest.raises(AttributeError):
+            compact_cls.port_table.slot.__get__(device, compact_cls)
+    assert device.port_table[0].port_idx == 1
+    assert device.port_table is device.port_table
+
+    device.port_table = []
+    assert device.port_table == []
+    assert compact_cls(port_table=[Port(port_idx=2)]).port_table[0].port_idx == 2
+
+
+def test_lazy_tables_diff():
+    """Verify diff compares undecoded tables on their raw data."""
+    raw = {"mac": "1", "name": "a", "port_table": [{"port_idx": 1, "up": True}]}
+    device = Device.from_json(raw)
+    renamed = Device.from_json({**raw, "name": "b"})
+    assert renamed.diff(device) == {"name"}
+    assert "port_table" not in vars(device)
+    assert "port_table" not in vars(renamed)
+
+    port_down = Device.from_json({**raw, "port_table": [{"port_idx": 1, "up": False}]})
+    assert port_down.diff(device) == {"port_table"}
+    assert "port_table" not in vars(port_down)
+
+    # Items without raw data for a table are compared on its values
+    assert port_down.port_table != device.port_table
+    assert port_down.diff(device) == {"port_table"}
+    assert renamed.diff(Device(mac="1", name="b")) == {"port_table"}
+
+    # Replaced tables no longer share the raw data of the original
+    replaced = device.replace(Device(port_table=port_down.port_table))
+    assert "port_table" not in replaced.raw
+    assert "port_table" in replaced.diff(device)
+    assert "port_table" not in replaced.diff(port_down)
+
+
+def test_projected_devices_without_tables():
+    """Verify ports and outlets of devices projected without tables are skipped."""
+    client = UnifiClient(Mock)
+    raw = {
+        "mac": "1",
+        "name": "a",
+        "state": 1,
+        "port_table": [{"port_idx": 1}],
+        "outlet_table": [{"index": 1}],
+    }
+    client.devices.process_raw([raw])
+    assert list(client.ports) == ["1_1"]
+    assert list(client.outlets) == ["1_1"]
+
+    client.devices.use_compact_items(projection=["mac", "name", "state"])
+    client.devices.process_raw([{**raw, "name": "b"}])
+    assert client.devices["1"].name == "b"
+    assert list(client.ports) == []
+    assert list(client.outlets) == []
+
+    client.devices.use_compact_items(projection=["mac", "port_table"])
+    client.devices.process_raw([raw])
+    assert list(client.ports) == ["1_1"]
+    assert list(client.outlets) == []
+
+
+DEVICE_TABLES = [
+    pytest.param("ports", "port_table", "port_idx", "up", id="ports"),
+    pytest.param("outlets", "outlet_table", "index", "relay_state", id="outlets"),
+]
+
+
+@pytest.mark.parametrize(("handler_name", "table", "index", "field"), DEVICE_TABLES)
+def test_device_table_changes(handler_name, table, index, field):
+    """Verify only changed items of the signalled device are touched."""
+    client = UnifiClient(Mock)
+    handler = getattr(client, handler_name)
+
+    def sync(mac, *rows):
+        client.devices.process_raw(
+            [{"mac": mac, table: [{index: idx, field: value} for idx, value in rows]}]
+        )
+
+    sync("dev1", (1, False), (2, False))
+    sync("dev10", (1, False))
+    handler.subscribe(callback := Mock())
+
+    sync("dev1", (1, False), (2, True))
+    callback.assert_called_once_with(ItemEvent.CHANGED, "dev1_2")
+    assert getattr(handler["dev1_2"], field) is True
+
+    callback.reset_mock()
+    sync("dev1", (2, True))
+    callback.assert_called_once_with(ItemEvent.DELETED, "dev1_1")
+
+    callback.reset_mock()
+    del client.devices["dev1"]
+    callback.assert_called_once_with(ItemEvent.DELETED, "dev1_2")
+    assert set(handler) == {"dev10_1"}
+
+
+@pytest.mark.parametrize(("handler_name", "table", "index", "field"), DEVICE_TABLES)
+@pytest.mark.parametrize("raw_mode", list(RawMode))
+def test_device_table_compact_devices(handler_name, table, index, field, raw_mode):
+    """Verify items of compact devices are updated when their fields change."""
+    client = UnifiClient(Mock)
+    client.devices.use_compact_items(raw_mode)
+    handler = getattr(client, handler_name)
+    handler.subscribe(callback := Mock())
+
+    def sync(value):
+        client.devices.process_raw(
+            [{"mac": "1", table: [{index: 1, field: value}, {index: 2, field: False}]}]
+        )
+
+    sync(False)
+    callback.reset_mock()
+    sync(True)
+    assert getattr(handler["1_1"], field) is True
+    callback.assert_called_once_with(ItemEvent.CHANGED, "1_1")
+
+
+@pytest.mark.parametrize(("handler_name", "table", "index", "field"), DEVICE_TABLES)
+def test_device_table_unchanged(handler_name, table, index, field):
+    """Verify device tables with unchanged raw data aren't decoded."""
+    client = UnifiClient(Mock)
+    client.devices.subscribe_changes(changes := Mock())
+    handler = getattr(client, handler_name)
+    handler.subscribe(callback := Mock())
+    raw = {"mac": "1", "uptime": 1, table: [{index: 1, field: True}]}
+    client.devices.process_raw([raw])
+    callback.assert_called_once_with(ItemEvent.ADDED, "1_1")
+
+    callback.reset_mock()
+    client.devices.process_raw([{**raw, "uptime": 2, table: [{index: 1, field: True}]}])
+    changes.assert_called_once_with("1", frozenset({"uptime"}))
+    if table in Device._api_item_lazy_fields:
+        assert table not in vars(client.devices["1"])
+    callback.assert_not_called()
+
+    client.devices.process_raw([{**raw, table: [{index: 1, field: False}]}])
+    callback.assert_called_once_with(ItemEvent.CHANGED, "1_1")
+    assert getattr(handler["1_1"], field) is False
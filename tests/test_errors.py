@@ -47,3 +47,47 @@ async def test_raise_for_status(client_response, expected_error):
     else:
         # No error should be raised
         await errors.raise_for_status(client_response)
+
+
+@pytest.mark.parametrize(
+    ("status", "headers", "expected_error", "retry_after"),
+    [
+        (HTTPStatus.TOO_MANY_REQUESTS, {"Retry-After": "5"}, errors.TooManyRequests, 5),
+        (HTTPStatus.SERVICE_UNAVAILABLE, {}, errors.ServiceUnavailable, None),
+        (
+            HTTPStatus.SERVICE_UNAVAILABLE,
+            {"Retry-After": "Wed, 21 Oct 2015 07:28:00 -0000"},
+            errors.ServiceUnavailable,
+            0,
+        ),
+        (HTTPStatus.BAD_GATEWAY, {}, errors.BadGateway, None),
+    ],
+)
+async def test_raise_for_status_retry_after(
+    status, headers, expected_error, retry_after
+):
+    """Verify Retry-After is passed on with rate limit and unavailable errors."""
+    with pytest.raises(expected_error) as exc_info:
+        await errors.raise_for_status(Mock(status=status, headers=headers))
+    assert exc_info.value.retry_after == retry_after
+    assert isinstance(exc_info.value, errors.ResponseError) == (
+        status == HTTPStatus.TOO_MANY_REQUESTS
+    )
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        (None, None),
+        ("120", 120),
+        (" 3 ", 3),
+        ("Wed, 21 Oct 2015 07:28:00 GMT", 0),
+        ("Wed, 21 Oct 2099 07:28:00 GMT", pytest.approx(2.4e9, rel=0.1)),
+        ("Wed, 21 Oct 2015 07:28:00 -0000", 0),
+        ("Wed, 21 Oct 2099 07:28:00 -0000", pytest.approx(2.4e9, rel=0.1)),
+        ("soon", None),
+    ],
+)
+def test_parse_retry_after(value, expected):
+    """Verify Retry-After is parsed from seconds and HTTP dates."""
+    assert errors.parse_retry_after(value) == expected
@@ -7,9 +7,23 @@ from unittest.mock import Mock, patch
 
 import pytest
 
-from aiounifi.interfaces.messages import MessageHandler
+from aiounifi.interfaces.messages import MessageHandler, peek_message_key
+from aiounifi.models.configuration import (
+    ORJSON_CODEC,
+    STDLIB_CODEC,
+    Configuration,
+    JsonCodec,
+)
 from aiounifi.models.message import Message, MessageKey
 
+CODECS = [
+    STDLIB_CODEC,
+    pytest.param(
+        ORJSON_CODEC,
+        marks=pytest.mark.skipif(ORJSON_CODEC is None, reason="orjson not installed"),
+    ),
+]
+
 MESSAGE_HANDLER_DATA = [
     (None, False),  # No subscriber registered
     (MessageKey.CLIENT_REMOVED, True),  # Filter correct
@@ -60,8 +74,119 @@ def test_unsupported_message_key():
     assert message.meta.message == MessageKey.UNKNOWN
 
 
+@pytest.mark.parametrize("codec", CODECS)
 @patch("aiounifi.interfaces.messages.LOGGER")
-def test_message_handler_bad_json_data(logger_mock):
+def test_message_handler_bad_json_data(logger_mock, codec: JsonCodec):
     """Verify message handler catches json error."""
-    MessageHandler(controller=Mock()).new_data(b"")
+    config = Configuration("host", username="user", password="pass", codec=codec)
+    MessageHandler(controller=Mock(config=config)).new_data(b"")
     assert logger_mock.debug.called
+
+
+@pytest.mark.parametrize("codec", CODECS)
+@pytest.mark.parametrize("raw", [str, str.encode])
+def test_message_handler_codec(codec: JsonCodec, raw):
+    """Verify websocket frames are decoded with the configured codec."""
+    config = Configuration("host", username="user", password="pass", codec=codec)
+    message_handler = MessageHandler(controller=Mock(config=config))
+    message_handler.subscribe(mock_callback := Mock(), MessageKey.CLIENT_REMOVED)
+
+    message_handler.new_data(
+        raw('{"meta": {"rc": "ok", "message": "user:delete"}, "data": [{"mac": "1"}]}')
+    )
+    mock_callback.assert_called_once()
+    assert mock_callback.call_args.args[0].data == {"mac": "1"}
+
+
+@pytest.mark.parametrize("codec", CODECS)
+def test_codec_round_trip(codec: JsonCodec):
+    """Verify codecs decode what they encode."""
+    data = {"meta": {"rc": "ok"}, "data": [{"name": "å", "value": 1.5}]}
+    assert isinstance(codec.dumps(data), str)
+    assert codec.loads(codec.dumps(data)) == data
+
+
+@pytest.mark.parametrize(
+    ("raw", "expected"),
+    [
+        (
+            '{"meta": {"rc": "ok", "message": "sta:sync"}, "data": []}',
+            MessageKey.CLIENT,
+        ),
+        (b'{"meta":{"message":"device:sync","rc":"ok"},"data":[]}', MessageKey.DEVICE),
+        ('{"meta": {"message": "not a key"}, "data": []}', MessageKey.UNKNOWN),
+        ('{"data": [], "meta": {"rc": "ok", "message": "sta:sync"}}', None),
+        ('{"meta": {"rc": {"nested": 1}, "message": "sta:sync"}, "data": []}', None),
+        ('{"meta": {"message": "sta\\u003async"}, "data": []}', None),
+        ("", None),
+    ],
+)
+def test_peek_message_key(raw, expected):
+    """Verify the message key is extracted from the meta header."""
+    assert peek_message_key(raw) == expected
+
+
+def test_message_handler_skips_unsubscribed_frames():
+    """Verify frames without subscribers are dropped before being decoded."""
+    codec = Mock(loads=Mock(side_effect=STDLIB_CODEC.loads))
+    message_handler = MessageHandler(controller=Mock(config=Mock(codec=codec)))
+    message_handler.subscribe(mock_callback := Mock(), MessageKey.DEVICE)
+
+    message_handler.new_data('{"meta": {"message": "sta:sync"}, "data": [{}]}')
+    codec.loads.assert_not_called()
+
+    message_handler.new_data('{"meta": {"message": "device:sync"}, "data": [{}]}')
+    codec.loads.assert_called_once()
+    mock_callback.assert_called_once()
+
+    # Frames that can't be peeked are fully decoded before being filtered
+    message_handler.new_data('{"data": [{}], "meta": {"message": "sta:sync"}}')
+    assert codec.loads.call_count == 2
+    mock_callback.assert_called_once()
+
+
+def test_message_handler_dispatch():
+    """Verify messages are dispatched per message key in subscription order."""
+    message_handler = MessageHandler(controller=Mock())
+    calls = []
+
+    def callback(name):
+        return lambda message: calls.append((name, message))
+
+    message_handler.subscribe(callback("client"), MessageKey.CLIENT)
+    unsub_all = message_handler.subscribe(callback("all"))
+    unsub_device = message_handler.subscribe(callback("device"), MessageKey.DEVICE)
+    message_handler.subscribe(callback("both"), (MessageKey.CLIENT, MessageKey.DEVICE))
+
+    message_handler.handler(
+        {"meta": {"message": MessageKey.CLIENT.value}, "data": [{"id": 1}, {"id": 2}]}
+    )
+    assert [(name, message.data) for name, message in calls] == [
+        ("client", {"id": 1}),
+        ("all", {"id": 1}),
+        ("both", {"id": 1}),
+        ("client", {"id": 2}),
+        ("all", {"id": 2}),
+        ("both", {"id": 2}),
+    ]
+    # Meta is parsed once per frame
+    assert len({id(message.meta) for _, message in calls}) == 1
+
+    calls.clear()
+    unsub_device()
+    unsub_all()
+    message_handler.handler(
+        {"meta": {"message": MessageKey.DEVICE.value}, "data": [{"id": 3}]}
+    )
+    assert [name for name, _ in calls] == ["both"]
+    assert set(message_handler._dispatch) == {MessageKey.CLIENT, MessageKey.DEVICE}
+
+
+@patch("aiounifi.interfaces.messages.LOGGER")
+def test_message_handler_unsupported_message(logger_mock):
+    """Verify unsupported messages are logged once per frame and not dispatched."""
+    message_handler = MessageHandler(controller=Mock())
+    message_handler.subscribe(mock_callback := Mock())
+    message_handler.handler({"meta": {"message": "unsupported"}, "data": [{}, {}]})
+    logger_mock.warning.assert_called_once()
+    mock_callback.assert_not_called()
@@ -42,3 +42,12 @@ def test_process_item(input, expected, expected_error):
     else:
         networks.process_raw(input)
         assert list(networks.values()) == expected
+
+
+def test_process_item_unchanged():
+    """Verify identical payloads don't replace network configurations."""
+    networks = Networks(Mock())
+    networks.process_item({"_id": "corporate_id", "purpose": "corporate"})
+    network = networks["corporate_id"]
+    networks.process_item({"_id": "corporate_id", "purpose": "corporate"})
+    assert networks["corporate_id"] is network
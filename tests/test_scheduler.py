@@ -0,0 +1,109 @@
+"""Test request scheduler.
+
+pytest --cov-report term-missing --cov=aiounifi.scheduler tests/test_scheduler.py
+"""
+
+import asyncio
+
+import pytest
+
+from aiounifi.scheduler import RequestPriority, RequestScheduler, RetryBudget
+
+
+async def test_scheduler_order():
+    """Verify waiting requests are sent by priority and round robin across sites."""
+    scheduler = RequestScheduler(1)
+    order = []
+
+    async def request(name, priority, site):
+        async with scheduler.slot(priority, site):
+            order.append(name)
+            await asyncio.sleep(0)
+
+    await scheduler.acquire(RequestPriority.LIST, "a")
+    requests = [
+        asyncio.create_task(request(*args))
+        for args in (
+            ("list a1", RequestPriority.LIST, "a"),
+            ("list a2", RequestPriority.LIST, "a"),
+            ("list b1", RequestPriority.LIST, "b"),
+            ("command a1", RequestPriority.COMMAND, "a"),
+            ("list c1", RequestPriority.LIST, "c"),
+        )
+    ]
+    await asyncio.sleep(0)
+    assert order == []
+
+    scheduler.release()
+    await asyncio.gather(*requests)
+    assert order == ["command a1", "list a1", "list b1", "list c1", "list a2"]
+    assert scheduler.in_flight == 0
+
+
+async def test_scheduler_max_in_flight():
+    """Verify no more than max_in_flight requests hold a slot."""
+    scheduler = RequestScheduler(2)
+    release = asyncio.Event()
+    peak = 0
+
+    async def request():
+        nonlocal peak
+        async with scheduler.slot(RequestPriority.LIST, "default"):
+            peak = max(peak, scheduler.in_flight)
+            await release.wait()
+
+    requests = [asyncio.create_task(request()) for _ in range(5)]
+    await asyncio.sleep(0)
+    assert scheduler.in_flight == 2
+    release.set()
+    await asyncio.gather(*requests)
+    assert peak == 2
+    assert scheduler.in_flight == 0
+
+
+async def test_scheduler_cancelled():
+    """Verify cancelled requests don't keep or lose slots."""
+    scheduler = RequestScheduler(1)
+    await scheduler.acquire(RequestPriority.LIST, "a")
+
+    waiting = asyncio.create_task(scheduler.acquire(RequestPriority.LIST, "a"))
+    granted = asyncio.create_task(scheduler.acquire(RequestPriority.LIST, "a"))
+    last = asyncio.create_task(scheduler.acquire(RequestPriority.LIST, "a"))
+    await asyncio.sleep(0)
+
+    # Cancelled while waiting, skipped when the slot is released
+    waiting.cancel()
+    # Cancelled after the slot was handed over, passed on to the next request
+    scheduler.release()
+    granted.cancel()
+    await asyncio.gather(waiting, granted, return_exceptions=True)
+    assert waiting.cancelled()
+    assert granted.cancelled()
+
+    await last
+    assert scheduler.in_flight == 1
+    scheduler.release()
+    assert scheduler.in_flight == 0
+
+
+def test_scheduler_max_in_flight_validation():
+    """Verify at least one request must be allowed in flight."""
+    with pytest.raises(ValueError, match="at least 1"):
+        RequestScheduler(0)
+
+
+def test_retry_budget():
+    """Verify retries are limited to a fraction of requests."""
+    budget = RetryBudget(0.5, 2)
+    assert budget.withdraw()
+    assert budget.withdraw()
+    assert not budget.withdraw()
+
+    budget.deposit()
+    assert not budget.withdraw()
+    budget.deposit()
+    assert budget.withdraw()
+
+    for _ in range(10):
+        budget.deposit()
+    assert budget.tokens == 2